@@ -0,0 +1,1681 @@
+import abc
+import datetime
+import enum
+import json
+import os
+import queue
+import re
+import select
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FuturoEsgotado
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import streamlit as st
+
+import agyte_metricas as metricas
+
+# ==============================
+# CONFIGURAÇÃO
+# ==============================
+def _config(chave, padrao=None):
+    """Lê uma configuração de st.secrets, com fallback para variáveis de ambiente."""
+    try:
+        valor = st.secrets.get(chave)
+    except Exception:
+        valor = None
+    if valor is None:
+        valor = os.environ.get(chave, padrao)
+    return valor
+
+
+def _parametros_conexao():
+    """Parâmetros de conexão do psycopg2 a partir das configurações."""
+    return dict(
+        host=_config("DB_HOST"),
+        database=_config("DB_NAME"),
+        user=_config("DB_USER"),
+        password=_config("DB_PASSWORD"),
+        port=int(_config("DB_PORT", 5432)),
+        connect_timeout=int(_config("DB_CONNECT_TIMEOUT", 3))  # evita travar por muito tempo
+    )
+
+
+def _parametros_replica():
+    """Parâmetros da réplica de leitura, ou None se DB_REPLICA_HOST não estiver configurado.
+
+    Usuário, senha e banco são os mesmos do primário.
+    """
+    host = _config("DB_REPLICA_HOST")
+    if not host:
+        return None
+    return dict(_parametros_conexao(), host=host, port=int(_config("DB_REPLICA_PORT", _config("DB_PORT", 5432))))
+
+
+# ==============================
+# POOL DE CONEXÕES
+# ==============================
+class PoolEsgotado(Exception):
+    """Nenhuma conexão foi liberada dentro do tempo de espera."""
+
+
+class PoolConexoes:
+    """Pool thread-safe de conexões, compartilhado por todas as sessões do processo.
+
+    Envolve o ThreadedConnectionPool do psycopg2 com uma espera limitada por
+    conexão livre (em vez de falhar na hora) e um ping nas conexões que
+    ficaram ociosas por mais de `ping_apos` segundos.
+    """
+
+    def __init__(self, minimo, maximo, espera, ping_apos, **parametros):
+        self._pool = ThreadedConnectionPool(minimo, maximo, **parametros)
+        self._vagas = threading.BoundedSemaphore(maximo)
+        self._espera = espera
+        self._ping_apos = ping_apos
+        self._ociosa_desde = {}
+        self._trava = threading.Lock()
+
+    def emprestar(self):
+        """Retira uma conexão do pool, esperando no máximo `espera` segundos."""
+        if not self._vagas.acquire(timeout=self._espera):
+            raise PoolEsgotado(f"Nenhuma conexão livre em {self._espera}s")
+        try:
+            conn = self._pool.getconn()
+            with self._trava:
+                ociosa_desde = self._ociosa_desde.pop(id(conn), None)
+            if conn.closed or (ociosa_desde is not None and time.monotonic() - ociosa_desde > self._ping_apos and not self._ping(conn)):
+                # Conexão morta (reinício do banco, timeout de firewall): troca por uma nova
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+            if not conn.autocommit:
+                # Leituras não deixam transação aberta; escritas fazem uma única instrução
+                conn.autocommit = True
+            return conn
+        except Exception:
+            self._vagas.release()
+            raise
+
+    def devolver(self, conn, descartar=False):
+        """Devolve a conexão ao pool, descartando-a se estiver quebrada."""
+        try:
+            if not descartar and not conn.closed:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    # Em autocommit o rollback() do psycopg2 não faz nada, e um
+                    # BEGIN explícito (escrita em lote) pode ter ficado aberto
+                    with conn.cursor() as cur:
+                        cur.execute("ROLLBACK")
+            descartar = descartar or bool(conn.closed)
+        except Exception:
+            descartar = True
+        try:
+            if not descartar:
+                with self._trava:
+                    self._ociosa_desde[id(conn)] = time.monotonic()
+            self._pool.putconn(conn, close=descartar)
+        finally:
+            self._vagas.release()
+
+    def forcar_ping(self):
+        """Faz as conexões ociosas passarem pelo ping antes do próximo uso."""
+        with self._trava:
+            for chave in self._ociosa_desde:
+                self._ociosa_desde[chave] = float("-inf")
+
+    @staticmethod
+    def _ping(conn):
+        """Confere se uma conexão ociosa ainda responde."""
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+
+@st.cache_resource(show_spinner=False)
+def obter_pool():
+    """Cria o pool uma única vez por processo (compartilhado entre sessões).
+
+    Se o banco estiver fora do ar a exceção sobe e nada fica em cache, então
+    a próxima chamada tenta de novo.
+    """
+    return PoolConexoes(
+        minimo=int(_config("DB_POOL_MIN", 1)),
+        maximo=int(_config("DB_POOL_MAX", 10)),
+        espera=float(_config("DB_POOL_ESPERA", 5)),
+        ping_apos=float(_config("DB_POOL_PING_APOS", 30)),
+        connection_factory=ConexaoAgyte,
+        **_parametros_conexao()
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def obter_pool_replica():
+    """Pool da réplica de leitura, separado do pool do primário."""
+    return PoolConexoes(
+        minimo=int(_config("DB_POOL_MIN", 1)),
+        maximo=int(_config("DB_REPLICA_POOL_MAX", _config("DB_POOL_MAX", 10))),
+        espera=float(_config("DB_POOL_ESPERA", 5)),
+        ping_apos=float(_config("DB_POOL_PING_APOS", 30)),
+        connection_factory=ConexaoAgyte,
+        **_parametros_replica()
+    )
+
+
+# ==============================
+# DISJUNTOR (CIRCUIT BREAKER)
+# ==============================
+class Disjuntor:
+    """Estado de saúde do banco compartilhado pelo processo.
+
+    Depois de `limite` falhas seguidas de conexão ou consulta o disjuntor
+    abre: conexao() passa a entregar None na hora, sem esperar timeout, e
+    uma thread testa o banco a cada `intervalo` segundos até ele voltar.
+    """
+
+    def __init__(self, parametros, limite=3, intervalo=5, ao_fechar=None):
+        self._parametros = parametros
+        self._limite = limite
+        self._intervalo = intervalo
+        self._ao_fechar = ao_fechar
+        self._falhas = 0
+        self._aberto = False
+        self._trava = threading.Lock()
+
+    @property
+    def aberto(self):
+        return self._aberto
+
+    def registrar_sucesso(self):
+        with self._trava:
+            self._falhas = 0
+
+    def registrar_falha(self):
+        with self._trava:
+            self._falhas += 1
+            if self._aberto or self._falhas < self._limite:
+                return
+            self._aberto = True
+        print(f"Disjuntor aberto após {self._limite} falhas seguidas do banco")
+        threading.Thread(target=self._sondar, name="agyte-disjuntor", daemon=True).start()
+
+    def _sondar(self):
+        while True:
+            time.sleep(self._intervalo)
+            try:
+                conn = psycopg2.connect(**self._parametros)
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                finally:
+                    conn.close()
+            except Exception:
+                continue
+            break
+
+        if self._ao_fechar is not None:
+            try:
+                self._ao_fechar()
+            except Exception as e:
+                print(f"Erro ao renovar o pool: {e}")
+        with self._trava:
+            self._falhas = 0
+            self._aberto = False
+        print("Disjuntor fechado: banco respondendo de novo")
+
+
+def _renovar_pool():
+    # Depois de uma queda, as conexões que ficaram no pool provavelmente
+    # morreram; o ping evita que elas reabram o disjuntor
+    obter_pool().forcar_ping()
+
+
+def _renovar_pool_replica():
+    obter_pool_replica().forcar_ping()
+
+
+@st.cache_resource(show_spinner=False)
+def obter_disjuntor():
+    """Disjuntor único do processo."""
+    return Disjuntor(
+        _parametros_conexao(),
+        limite=int(_config("DB_DISJUNTOR_FALHAS", 3)),
+        intervalo=float(_config("DB_DISJUNTOR_SONDA", 5)),
+        ao_fechar=_renovar_pool
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def obter_disjuntor_replica():
+    """Disjuntor da réplica: réplica fora do ar não derruba o primário, e vice-versa."""
+    return Disjuntor(
+        _parametros_replica(),
+        limite=int(_config("DB_DISJUNTOR_FALHAS", 3)),
+        intervalo=float(_config("DB_DISJUNTOR_SONDA", 5)),
+        ao_fechar=_renovar_pool_replica
+    )
+
+
+# ==============================
+# ROTEAMENTO LEITURA/ESCRITA
+# ==============================
+# Com a réplica atrasada mais que isso (s), as leituras vão para o primário
+ATRASO_MAXIMO_REPLICA = float(_config("DB_REPLICA_ATRASO_MAX", 5))
+
+# "primario": réplica fora do ar ou atrasada manda as leituras para o primário;
+# "desligado": as leituras falham e a página mostra os últimos números conhecidos
+FALLBACK_REPLICA = _config("DB_REPLICA_FALLBACK", "primario")
+
+# O atraso é medido no máximo uma vez por intervalo, não a cada leitura
+_INTERVALO_ATRASO = 2
+_estado_replica = {"medido_em": 0.0, "atrasada": False}
+
+# Momento da última inscrição de cada evento neste processo: até
+# ATRASO_MAXIMO_REPLICA depois dela a réplica pode não tê-la, então as
+# releituras do evento vão ao primário (quem se inscreveu vê o próprio número)
+_escritas = {}
+
+
+def _ler_da_replica(evento):
+    """Se as leituras de exibição do evento podem ir para a réplica agora."""
+    return time.monotonic() - _escritas.get(evento, float("-inf")) > ATRASO_MAXIMO_REPLICA
+
+
+def _replica_atrasada(conn):
+    """Se a réplica está mais de ATRASO_MAXIMO_REPLICA segundos atrás do primário."""
+    agora = time.monotonic()
+    if agora - _estado_replica["medido_em"] < _INTERVALO_ATRASO:
+        return _estado_replica["atrasada"]
+
+    try:
+        with conn.cursor() as cur:
+            # Sem receptor de WAL (primário fora, replicação parada) não dá para
+            # saber o quanto falta: conta como atrasada. Conectada e sem WAL
+            # pendente, está em dia mesmo sem escritas recentes
+            cur.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() IS NULL
+                        OR NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver) THEN 'Infinity'::float8
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 'Infinity')
+                END
+            """)
+            atraso = float(cur.fetchone()[0])
+    except psycopg2.Error as e:
+        print(f"Erro ao medir atraso da réplica: {e}")
+        atraso = float("inf")
+
+    atrasada = atraso > ATRASO_MAXIMO_REPLICA
+    if atrasada and not _estado_replica["atrasada"]:
+        descricao = "sem receber WAL do primário" if atraso == float("inf") else f"{atraso:.1f}s"
+        print(f"Réplica atrasada ({descricao}); leituras seguem a política '{FALLBACK_REPLICA}'")
+    _estado_replica.update(medido_em=agora, atrasada=atrasada)
+    return atrasada
+
+
+@contextmanager
+def _emprestar(disjuntor, obter, nome, escrita=False):
+    """Empresta uma conexão do pool devolvido por `obter`, protegida pelo disjuntor."""
+    if disjuntor.aberto:
+        yield None
+        return
+
+    try:
+        with metricas.ESPERA_CONEXAO.cronometrar(pool=nome):
+            pool = obter()
+            conn = pool.emprestar()
+    except PoolEsgotado as e:
+        # Pool saturado não é banco fora do ar: não conta para o disjuntor
+        print(f"Erro ao obter conexão: {e}")
+        metricas.ERROS_DB.inc(operacao="pool_esgotado")
+        if escrita:
+            raise
+        yield None
+        return
+    except Exception as e:
+        print(f"Erro ao obter conexão: {e}")
+        metricas.ERROS_DB.inc(operacao="conexao")
+        disjuntor.registrar_falha()
+        yield None
+        return
+
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        pool.devolver(conn, descartar=True)
+        metricas.ERROS_DB.inc(operacao="conexao")
+        disjuntor.registrar_falha()
+        raise
+    except BaseException:
+        pool.devolver(conn)
+        raise
+    else:
+        pool.devolver(conn)
+        disjuntor.registrar_sucesso()
+
+
+@contextmanager
+def conexao(leitura=False, escrita=False):
+    """Empresta uma conexão do pool. Entrega None se o banco estiver inacessível.
+
+    Com leitura=True (consultas só de exibição) a conexão vem da réplica,
+    quando configurada e em dia. Inscrição e checagens que decidem a
+    inscrição ficam sempre no primário. Com escrita=True o pool saturado
+    (banco no ar, só ocupado) sobe como PoolEsgotado em vez de None, para a
+    inscrição não ir para a fila local por causa de um pico.
+    """
+    if leitura and _parametros_replica() is not None:
+        with _emprestar(obter_disjuntor_replica(), obter_pool_replica, "replica") as conn:
+            if conn is not None and not _replica_atrasada(conn):
+                yield conn
+                return
+        if FALLBACK_REPLICA != "primario":
+            yield None
+            return
+
+    with _emprestar(obter_disjuntor(), obter_pool, "primario", escrita) as conn:
+        yield conn
+
+
+# ==============================
+# ACESSO AOS DADOS
+# ==============================
+class Rejeicao(enum.Enum):
+    """Motivos pelos quais uma inscrição pode ser recusada."""
+    ESGOTADO = "esgotado"
+    CPF_DUPLICADO = "cpf_duplicado"
+    ERRO = "erro"
+
+
+@dataclass
+class EstatisticasEvento:
+    """Contadores exibidos na página.
+
+    `desatualizado_desde` é preenchido quando o banco não respondeu e os
+    números são os últimos conhecidos (horário da última leitura boa).
+    """
+    total: int = 0
+    proximo_numero: int = 1
+    desatualizado_desde: Optional[float] = None
+
+
+@dataclass
+class ResultadoInscricao:
+    """Número VIP atribuído, protocolo provisório (fila local) ou o motivo da recusa."""
+    numero_vip: Optional[int] = None
+    rejeicao: Optional[Rejeicao] = None
+    mensagem: str = ""
+    protocolo: Optional[str] = None
+
+    @property
+    def confirmado(self):
+        return self.numero_vip is not None
+
+    @property
+    def pendente(self):
+        # Na fila local: nem número VIP nem recusa, ainda
+        return self.rejeicao is None and self.numero_vip is None
+
+
+# Nome do índice único de sql/001_cpf_normalizado.sql
+INDICE_CPF_UNICO = "agyte_participantes_evento_cpf_uidx"
+
+# ==============================
+# CONSULTAS DO CAMINHO QUENTE
+# ==============================
+# Cada consulta tem um nome e parâmetros nomeados do psycopg2. Com
+# DB_PREPARADAS=sessao (padrão) elas são preparadas no servidor uma vez por
+# conexão (PREPARE) e depois só executadas pelo nome (EXECUTE). Com
+# DB_PREPARADAS=desligado o texto é enviado a cada vez, o que é necessário
+# atrás de um pgbouncer em modo transaction, onde a sessão do servidor muda
+# entre transações. O texto não pode conter '%' fora dos parâmetros.
+CONSULTAS = {
+    # Cria a linha do contador de um evento novo
+    "agyte_garantir_contador": """
+        INSERT INTO public.agyte_evento_contadores (evento) VALUES (%(evento)s)
+        ON CONFLICT (evento) DO NOTHING
+    """,
+    # O UPDATE na linha do contador do evento checa a capacidade e aloca o
+    # número VIP; o lock dessa linha serializa inscrições simultâneas. CPF
+    # repetido é barrado pelo índice único, que desfaz também o UPDATE.
+    "agyte_inscrever": """
+        WITH alocado AS (
+            UPDATE public.agyte_evento_contadores
+            SET emitidos = emitidos + 1,
+                proximo_numero = proximo_numero + 1
+            WHERE evento = %(evento)s AND emitidos < %(capacidade)s
+            RETURNING proximo_numero - 1 AS numero_vip, emitidos
+        ), novo AS (
+            INSERT INTO public.agyte_participantes
+                (nome, cpf, setor, unidade, telefone, numero_vip, evento)
+            SELECT %(nome)s, %(cpf)s, %(setor)s, %(unidade)s, %(telefone)s, numero_vip, %(evento)s
+            FROM alocado
+            RETURNING numero_vip
+        )
+        SELECT novo.numero_vip, alocado.emitidos FROM novo, alocado
+    """,
+    "agyte_estatisticas": """
+        SELECT emitidos, proximo_numero FROM public.agyte_evento_contadores WHERE evento = %(evento)s
+    """,
+    "agyte_cpf_existe": """
+        SELECT EXISTS (
+            SELECT 1 FROM public.agyte_participantes
+            WHERE evento = %(evento)s AND cpf_normalizado = %(cpf)s
+        )
+    """,
+}
+
+# Inscrição: as duas instruções vão na mesma query simples, que o PostgreSQL
+# executa como uma transação implícita (a conexão está em autocommit)
+INSCRICAO = ("agyte_garantir_contador", "agyte_inscrever")
+
+MODO_PREPARADAS = str(_config("DB_PREPARADAS", "sessao")).lower()
+
+_PARAMETRO = re.compile(r"%\((\w+)\)s")
+
+
+def _para_prepare(sql):
+    """Troca os parâmetros nomeados por $1, $2... na ordem em que aparecem."""
+    ordem = []
+
+    def trocar(parametro):
+        if parametro.group(1) not in ordem:
+            ordem.append(parametro.group(1))
+        return f"${ordem.index(parametro.group(1)) + 1}"
+
+    return _PARAMETRO.sub(trocar, sql), ordem
+
+
+_PREPARADAS = {nome: _para_prepare(sql) for nome, sql in CONSULTAS.items()}
+
+
+# ==============================
+# RASTREIO DE CONSULTAS
+# ==============================
+RASTREIO_SQL = str(_config("SQL_RASTREIO", "1")).lower() not in ("0", "false", "nao", "não")
+
+# Instruções acima disso (ms) vão para o log
+SQL_LENTA = float(_config("SQL_LENTA_MS", 100)) / 1000
+
+# "0": só o log; "1": junta o EXPLAIN da instrução lenta; "analyze": EXPLAIN ANALYZE nas leituras
+SQL_EXPLAIN = str(_config("SQL_EXPLAIN", "0")).lower()
+
+_TABELA = re.compile(r"\bpublic\.(\w+)")
+
+# Quadros que não contam como "quem chamou" a instrução
+_QUADROS_INTERNOS = {"execute", "_rastrear", "_funcao_chamadora", "executar"}
+
+
+def _nome_instrucao(sql):
+    """Nome curto de uma instrução avulsa: comando e primeira tabela (SELECT agyte_evento_contadores)."""
+    if isinstance(sql, bytes):
+        sql = sql.decode(errors="replace")
+    comando = sql.split(None, 1)[0].upper() if sql.strip() else "?"
+    tabela = _TABELA.search(sql)
+    return f"{comando} {tabela.group(1)}" if tabela else comando
+
+
+def _funcao_chamadora():
+    quadro = sys._getframe(1)
+    while quadro is not None and (
+        quadro.f_code.co_name in _QUADROS_INTERNOS or quadro.f_globals.get("__name__", "").startswith("psycopg2")
+    ):
+        quadro = quadro.f_back
+    return quadro.f_code.co_name if quadro is not None else "?"
+
+
+def _explicar(conn, sql, parametros):
+    """Plano da instrução, ou None quando não dá para pedir com segurança."""
+    # Dentro de transação, um erro do EXPLAIN abortaria a transação de quem chamou
+    if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        return None
+    if isinstance(sql, bytes) or ";" in sql.strip().rstrip(";"):
+        return None
+
+    analisar = SQL_EXPLAIN == "analyze" and sql.lstrip().upper().startswith("SELECT")
+    try:
+        # Cursor comum: o próprio EXPLAIN não entra no rastreio
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute(("EXPLAIN (ANALYZE, BUFFERS) " if analisar else "EXPLAIN ") + sql, parametros)
+            return "\n".join(linha[0] for linha in cur.fetchall())
+    except psycopg2.Error as e:
+        return f"(EXPLAIN falhou: {e})"
+
+
+def _rastrear(cur, consulta, explicavel, duracao, erro=None):
+    funcao = _funcao_chamadora()
+    linhas = max(cur.rowcount, 0)
+    metricas.SQL_DURACAO.observar(duracao, consulta=consulta, funcao=funcao)
+    metricas.SQL_LINHAS.inc(linhas, consulta=consulta)
+    if erro is not None:
+        metricas.SQL_ERROS.inc(consulta=consulta, erro=type(erro).__name__)
+    if duracao < SQL_LENTA:
+        return
+
+    metricas.SQL_LENTAS.inc(consulta=consulta)
+    situacao = f"falhou com {type(erro).__name__}" if erro is not None else f"{linhas} linha(s)"
+    print(f"Consulta lenta: {consulta} em {funcao}, {duracao * 1000:.1f} ms, {situacao}")
+    # Depois de uma falha a transação pode estar abortada: sem EXPLAIN
+    if erro is None and SQL_EXPLAIN in ("1", "analyze") and explicavel is not None:
+        plano = _explicar(cur.connection, *explicavel)
+        if plano:
+            print(plano)
+
+
+class CursorAgyte(psycopg2.extensions.cursor):
+    """Cursor que mede cada instrução: nome, duração, linhas e a função que chamou.
+
+    `consulta` e `explicavel` valem para o próximo execute(); executar() os
+    preenche com o nome da consulta de CONSULTAS e o SQL dela.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.consulta = None
+        self.explicavel = None
+
+    def execute(self, sql, parametros=None):
+        if not RASTREIO_SQL:
+            return super().execute(sql, parametros)
+
+        consulta, explicavel = self.consulta, self.explicavel
+        self.consulta = self.explicavel = None
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            return super().execute(sql, parametros)
+        except Exception as e:
+            erro = e
+            raise
+        finally:
+            # Instruções que falham também entram na conta, com o tipo do erro
+            _rastrear(self, consulta or _nome_instrucao(sql), explicavel or (sql, parametros),
+                      time.perf_counter() - inicio, erro)
+
+
+class ConexaoAgyte(psycopg2.extensions.connection):
+    """Conexão do pool que lembra quais consultas já preparou no servidor."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preparadas = set()
+        self.cursor_factory = CursorAgyte
+
+
+def _rotular(cur, nomes, parametros):
+    """Nome e SQL explicável da próxima instrução, para o rastreio."""
+    if isinstance(cur, CursorAgyte):
+        cur.consulta = "+".join(nomes)
+        cur.explicavel = (CONSULTAS[nomes[-1]], parametros)
+
+
+def _desfazer_preparadas(cur, nomes):
+    """Apaga `nomes` no servidor (os que existirem lá) e na conexão, para prepará-los de novo."""
+    cur.execute("SELECT name FROM pg_prepared_statements WHERE name = ANY(%s)", (list(nomes),))
+    existentes = [linha[0] for linha in cur.fetchall()]
+    if existentes:
+        cur.execute(";".join(f"DEALLOCATE {nome}" for nome in existentes))
+    cur.connection.preparadas.difference_update(nomes)
+
+
+def executar(cur, nomes, parametros):
+    """Executa as consultas de CONSULTAS em uma única ida ao servidor.
+
+    O resultado disponível no cursor é o da última consulta.
+    """
+    if MODO_PREPARADAS == "desligado":
+        _rotular(cur, nomes, parametros)
+        cur.execute(";".join(CONSULTAS[nome] for nome in nomes), parametros)
+        return
+
+    conn = cur.connection
+    # Dentro de uma transação explícita (escrita em lote) o erro abortaria a
+    # transação inteira: o savepoint deixa desfazer só esta ida e tentar de novo
+    em_transacao = conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    for tentativa in (1, 2):
+        partes = ["SAVEPOINT agyte_executar"] if em_transacao else []
+        valores = []
+        for nome in nomes:
+            sql, ordem = _PREPARADAS[nome]
+            if nome not in conn.preparadas:
+                partes.append(f"PREPARE {nome} AS {sql}")
+            partes.append(f"EXECUTE {nome} ({', '.join(['%s'] * len(ordem))})" if ordem else f"EXECUTE {nome}")
+            valores.extend(parametros[chave] for chave in ordem)
+        try:
+            _rotular(cur, nomes, parametros)
+            cur.execute(";".join(partes), valores)
+        except (psycopg2.errors.DuplicatePreparedStatement, psycopg2.errors.InvalidSqlStatementName):
+            # O servidor e a conexão discordam sobre o que está preparado (DISCARD
+            # ALL de um pgbouncer em modo session, PREPARE de uma chamada que
+            # falhou depois): prepara de novo só estas consultas, uma vez
+            if tentativa == 2:
+                raise
+            if em_transacao:
+                cur.execute("ROLLBACK TO SAVEPOINT agyte_executar")
+            _desfazer_preparadas(cur, nomes)
+            continue
+        conn.preparadas.update(nomes)
+        return
+
+
+def normalizar_cpf(cpf):
+    """CPF canônico, somente com dígitos (mesmo formato de cpf_normalizado)."""
+    return ''.join(filter(str.isdigit, cpf or ""))
+
+
+def _recusa_cpf_duplicado():
+    return ResultadoInscricao(rejeicao=Rejeicao.CPF_DUPLICADO, mensagem="Este CPF já está cadastrado!")
+
+
+def _recusa_esgotado(capacidade):
+    return ResultadoInscricao(rejeicao=Rejeicao.ESGOTADO, mensagem=f"EVENTO ESGOTADO! Todas as {capacidade} vagas já foram preenchidas.")
+
+
+def _confirmacao(numero_vip):
+    return ResultadoInscricao(numero_vip=numero_vip, mensagem="Participante cadastrado com sucesso!")
+
+
+def _pendente(protocolo):
+    return ResultadoInscricao(
+        protocolo=protocolo,
+        mensagem="Inscrição recebida! A confirmação do número VIP sai assim que o sistema normalizar."
+    )
+
+
+def _apos_inscricao(evento, estatisticas=None):
+    # A página de quem acabou de se inscrever (ou bateu no limite) já
+    # precisa mostrar o contador novo, então o cache é descartado na hora
+    _escritas[evento] = time.monotonic()
+    _consultar_estatisticas.clear()
+    if estatisticas is not None:
+        # Não espera o NOTIFY chegar para o próprio processo refletir a inscrição
+        _atualizar_ouvinte(evento, estatisticas)
+
+
+def _registrar(conn, dados):
+    """Executa a inscrição atômica numa conexão já emprestada do pool.
+
+    Erros de conexão sobem para quem chamou; CPF repetido vira recusa.
+    """
+    try:
+        with conn.cursor() as cur:
+            executar(cur, INSCRICAO, dados)
+            resultado = cur.fetchone()
+    except psycopg2.IntegrityError as e:
+        if e.diag.constraint_name == INDICE_CPF_UNICO:
+            return _recusa_cpf_duplicado()
+        raise
+
+    if resultado is None:
+        _apos_inscricao(dados["evento"])
+        return _recusa_esgotado(dados["capacidade"])
+    numero_vip, emitidos = resultado
+    _apos_inscricao(dados["evento"], EstatisticasEvento(emitidos, numero_vip + 1))
+    return _confirmacao(numero_vip)
+
+
+def _registrar_lote(conn, pedidos):
+    """Registra várias inscrições numa única transação, com um único COMMIT.
+
+    Trava a linha do contador de cada evento (a mesma trava do caminho de uma
+    inscrição só), resolve CPF repetido e capacidade em memória, na ordem de
+    chegada, e grava todas as linhas com um INSERT de várias linhas.
+    """
+    if len(pedidos) == 1:
+        return [_registrar(conn, pedidos[0])]
+
+    resultados = [None] * len(pedidos)
+    por_evento = {}
+    for indice, dados in enumerate(pedidos):
+        por_evento.setdefault(dados["evento"], []).append(indice)
+
+    alterados = {}
+    with conn.cursor() as cur:
+        # Linha do contador de evento novo e PREPARE fora da transação do lote:
+        # nada disso trava, e um erro aqui não leva o lote inteiro junto
+        for evento in sorted(por_evento):
+            executar(cur, ("agyte_garantir_contador",), dict(evento=evento))
+
+        cur.execute("BEGIN")
+        try:
+            # Ordem fixa de travas entre processos evita deadlock
+            for evento in sorted(por_evento):
+                indices = por_evento[evento]
+                cur.execute(
+                    "SELECT emitidos, proximo_numero FROM public.agyte_evento_contadores WHERE evento = %s FOR UPDATE",
+                    (evento,)
+                )
+                emitidos, proximo_numero = cur.fetchone()
+                cur.execute(
+                    "SELECT cpf_normalizado FROM public.agyte_participantes WHERE evento = %s AND cpf_normalizado = ANY(%s)",
+                    (evento, [pedidos[indice]["cpf"] for indice in indices])
+                )
+                vistos = {linha[0] for linha in cur.fetchall()}
+
+                linhas = []
+                for indice in indices:
+                    dados = pedidos[indice]
+                    if dados["cpf"] in vistos:
+                        resultados[indice] = _recusa_cpf_duplicado()
+                    elif emitidos >= dados["capacidade"]:
+                        resultados[indice] = _recusa_esgotado(dados["capacidade"])
+                    else:
+                        vistos.add(dados["cpf"])
+                        linhas.append((dados["nome"], dados["cpf"], dados["setor"],
+                                       dados["unidade"], dados["telefone"], proximo_numero, evento))
+                        resultados[indice] = _confirmacao(proximo_numero)
+                        emitidos += 1
+                        proximo_numero += 1
+
+                if linhas:
+                    execute_values(cur, """
+                        INSERT INTO public.agyte_participantes
+                            (nome, cpf, setor, unidade, telefone, numero_vip, evento)
+                        VALUES %s
+                    """, linhas)
+                    cur.execute(
+                        "UPDATE public.agyte_evento_contadores SET emitidos = %s, proximo_numero = %s WHERE evento = %s",
+                        (emitidos, proximo_numero, evento)
+                    )
+                alterados[evento] = EstatisticasEvento(emitidos, proximo_numero) if linhas else None
+            cur.execute("COMMIT")
+        except BaseException:
+            if not conn.closed:
+                cur.execute("ROLLBACK")
+            raise
+
+    for evento, estatisticas in alterados.items():
+        _apos_inscricao(evento, estatisticas)
+    return resultados
+
+
+@metricas.DURACAO_DB.cronometrar(operacao="inserir_participante")
+def inserir_participante(nome, cpf, setor, unidade, telefone, evento="FUNCIONAL", capacidade=50):
+    """Inscreve o participante de forma atômica: checa capacidade e CPF, aloca o número VIP e insere.
+
+    Quem grava é o armazenamento configurado em ARMAZENAMENTO.
+    """
+    dados = dict(
+        nome=nome.upper(),
+        cpf=normalizar_cpf(cpf),
+        setor=setor,
+        unidade=unidade,
+        telefone=telefone,
+        evento=evento,
+        capacidade=capacidade
+    )
+    try:
+        resultado = obter_armazenamento().inscrever(dados)
+    except Exception as e:
+        metricas.ERROS_DB.inc(operacao="inserir_participante")
+        resultado = ResultadoInscricao(rejeicao=Rejeicao.ERRO, mensagem=str(e))
+
+    if resultado.pendente:
+        metricas.INSCRICOES.inc(resultado="pendente")
+    elif resultado.confirmado:
+        metricas.INSCRICOES.inc(resultado="confirmada")
+    else:
+        metricas.INSCRICOES.inc(resultado=resultado.rejeicao.value)
+    return resultado
+
+
+def _inscrever_postgres(dados):
+    """Inscrição no PostgreSQL.
+
+    Com o escritor em grupo ligado, a inscrição vai junto com as de outras
+    sessões num mesmo COMMIT. Com o banco inacessível ela vai para a fila
+    local e volta com um protocolo provisório; a confirmação sai quando a
+    fila for reenviada (consultar_protocolo). Com o pool saturado o banco
+    está no ar: a inscrição é recusada com um "tente de novo".
+    """
+    try:
+        escritor = obter_escritor()
+        if escritor is not None:
+            resultado = escritor.enviar(dados)
+            if resultado is not None:
+                return resultado
+        else:
+            with conexao(escrita=True) as conn:
+                if conn is not None:
+                    return _registrar(conn, dados)
+    except PoolEsgotado:
+        return ResultadoInscricao(rejeicao=Rejeicao.ERRO, mensagem="Muitas inscrições ao mesmo tempo. Tente novamente em instantes.")
+    except (psycopg2.OperationalError, psycopg2.InterfaceError, FuturoEsgotado) as e:
+        print(f"Banco caiu durante a inscrição, usando a fila local: {e}")
+        metricas.ERROS_DB.inc(operacao="inserir_participante")
+
+    fila = obter_fila()
+    if fila is None:
+        return ResultadoInscricao(rejeicao=Rejeicao.ERRO, mensagem="Banco de dados indisponível. Tente novamente em instantes.")
+    return fila.enfileirar(dados, ocupadas=_ocupadas_conhecidas(dados["evento"]))
+
+
+# ==============================
+# ESCRITOR EM GRUPO (GROUP COMMIT)
+# ==============================
+class EscritorEmGrupo:
+    """Thread única por processo que grava as inscrições de todas as sessões.
+
+    Junta o que chegar em até `janela` segundos (ou `lote` inscrições) e grava
+    tudo numa transação só, devolvendo a cada sessão o seu resultado. Em pico,
+    o limite deixa de ser um fsync de COMMIT por inscrição.
+    """
+
+    def __init__(self, janela=0.005, lote=100, espera=30):
+        self._janela = janela
+        self._lote = lote
+        self._espera = espera
+        self._pedidos = queue.Queue()
+        self._thread = threading.Thread(target=self._executar, name="agyte-escritor", daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def enviar(self, dados):
+        """Entrega a inscrição e espera o resultado do lote.
+
+        Devolve None se o banco estiver inacessível.
+        """
+        futuro = Future()
+        self._pedidos.put((dados, futuro))
+        return futuro.result(timeout=self._espera)
+
+    def _executar(self):
+        while True:
+            pedidos = [self._pedidos.get()]
+            prazo = time.monotonic() + self._janela
+            while len(pedidos) < self._lote:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    pedidos.append(self._pedidos.get(timeout=restante))
+                except queue.Empty:
+                    break
+            self._gravar(pedidos)
+
+    def _gravar(self, pedidos):
+        lote = [dados for dados, _ in pedidos]
+        try:
+            with conexao(escrita=True) as conn:
+                if conn is None:
+                    resultados = [None] * len(lote)
+                else:
+                    try:
+                        resultados = _registrar_lote(conn, lote)
+                    except psycopg2.IntegrityError:
+                        # Conflito que a trava não previu: uma por uma, como no caminho simples
+                        resultados = [_registrar(conn, dados) for dados in lote]
+        except Exception as e:
+            for _, futuro in pedidos:
+                futuro.set_exception(e)
+            return
+        for (_, futuro), resultado in zip(pedidos, resultados):
+            futuro.set_result(resultado)
+
+
+@st.cache_resource(show_spinner=False)
+def _iniciar_escritor():
+    return EscritorEmGrupo(
+        janela=float(_config("ESCRITOR_JANELA_MS", 5)) / 1000,
+        lote=int(_config("ESCRITOR_LOTE", 100)),
+        espera=float(_config("ESCRITOR_ESPERA", 30))
+    ).iniciar()
+
+
+def obter_escritor():
+    """Escritor em grupo do processo, ou None se desligado em ESCRITOR_EM_GRUPO."""
+    if str(_config("ESCRITOR_EM_GRUPO", "1")).lower() in ("0", "false", "nao", "não"):
+        return None
+    return _iniciar_escritor()
+
+
+# ==============================
+# FILA LOCAL (BANCO FORA DO AR)
+# ==============================
+class FilaLocal:
+    """Diário SQLite, em disco, das inscrições feitas com o banco fora do ar.
+
+    Cada inscrição recebe um protocolo provisório e fica pendente até uma
+    thread de reenvio conseguir registrá-la no PostgreSQL, em lotes, pelo
+    mesmo caminho atômico das inscrições normais; consultar() diz como ficou.
+    A fila não aceita mais inscrições do que as vagas que os últimos
+    contadores conhecidos deixam livres; o banco dá a palavra final no reenvio.
+    """
+
+    def __init__(self, caminho, intervalo=5, lote=50):
+        self._intervalo = intervalo
+        self._lote = lote
+        self._trava = threading.Lock()
+        self._db = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS inscricoes (
+                protocolo    TEXT PRIMARY KEY,
+                evento       TEXT NOT NULL,
+                cpf          TEXT NOT NULL,
+                nome         TEXT NOT NULL,
+                setor        TEXT,
+                unidade      TEXT,
+                telefone     TEXT,
+                capacidade   INTEGER NOT NULL,
+                criado_em    REAL NOT NULL,
+                situacao     TEXT NOT NULL DEFAULT 'pendente',
+                numero_vip   INTEGER,
+                resolvido_em REAL
+            )
+        """)
+        # O mesmo CPF não entra duas vezes na fila enquanto estiver pendente
+        self._db.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS inscricoes_pendentes_cpf
+            ON inscricoes (evento, cpf) WHERE situacao = 'pendente'
+        """)
+        self._thread = threading.Thread(target=self._executar, name="agyte-fila", daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def enfileirar(self, dados, ocupadas=0):
+        """Grava a inscrição no disco e devolve o protocolo provisório.
+
+        `ocupadas` são as vagas do evento já ocupadas no banco, pelos últimos
+        contadores conhecidos; junto com as pendentes na fila, decidem se
+        ainda cabe.
+        """
+        protocolo = "P-" + uuid.uuid4().hex[:8].upper()
+        try:
+            with self._trava:
+                repetido = self._db.execute(
+                    "SELECT 1 FROM inscricoes WHERE evento = ? AND cpf = ? AND situacao = 'pendente'",
+                    (dados["evento"], dados["cpf"])
+                ).fetchone()
+                if repetido:
+                    return _recusa_cpf_duplicado()
+                pendentes = self._db.execute(
+                    "SELECT COUNT(*) FROM inscricoes WHERE evento = ? AND situacao = 'pendente'", (dados["evento"],)
+                ).fetchone()[0]
+                if ocupadas + pendentes >= dados["capacidade"]:
+                    return _recusa_esgotado(dados["capacidade"])
+                self._db.execute("""
+                    INSERT INTO inscricoes
+                        (protocolo, evento, cpf, nome, setor, unidade, telefone, capacidade, criado_em)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (protocolo, dados["evento"], dados["cpf"], dados["nome"], dados["setor"],
+                      dados["unidade"], dados["telefone"], dados["capacidade"], time.time()))
+        except sqlite3.IntegrityError:
+            return _recusa_cpf_duplicado()
+        return _pendente(protocolo)
+
+    def consultar(self, protocolo):
+        """Situação atual de um protocolo como ResultadoInscricao, ou None se não existir."""
+        with self._trava:
+            linha = self._db.execute(
+                "SELECT situacao, numero_vip, capacidade FROM inscricoes WHERE protocolo = ?", (protocolo,)
+            ).fetchone()
+        if linha is None:
+            return None
+        situacao, numero_vip, capacidade = linha
+        if situacao == "pendente":
+            return _pendente(protocolo)
+        if situacao == "confirmado":
+            return replace(_confirmacao(numero_vip), protocolo=protocolo)
+        if situacao == Rejeicao.ESGOTADO.value:
+            return _recusa_esgotado(capacidade)
+        return _recusa_cpf_duplicado()
+
+    def _pendentes(self):
+        with self._trava:
+            linhas = self._db.execute("""
+                SELECT protocolo, evento, cpf, nome, setor, unidade, telefone, capacidade
+                FROM inscricoes WHERE situacao = 'pendente'
+                ORDER BY criado_em LIMIT ?
+            """, (self._lote,)).fetchall()
+        colunas = ("protocolo", "evento", "cpf", "nome", "setor", "unidade", "telefone", "capacidade")
+        return [dict(zip(colunas, linha)) for linha in linhas]
+
+    def _resolver(self, protocolo, situacao, numero_vip=None):
+        with self._trava:
+            self._db.execute(
+                "UPDATE inscricoes SET situacao = ?, numero_vip = ?, resolvido_em = ? WHERE protocolo = ?",
+                (situacao, numero_vip, time.time(), protocolo)
+            )
+
+    def _executar(self):
+        while True:
+            time.sleep(self._intervalo)
+            try:
+                self.reenviar()
+            except Exception as e:
+                print(f"Erro ao reenviar a fila local: {e}")
+
+    def reenviar(self):
+        """Envia ao banco as inscrições pendentes, um lote por transação."""
+        pendentes = self._pendentes()
+        while pendentes:
+            with conexao() as conn:
+                if conn is None:
+                    return
+                try:
+                    resultados = _registrar_lote(conn, pendentes)
+                except psycopg2.IntegrityError:
+                    resultados = [_registrar(conn, dados) for dados in pendentes]
+                for dados, resultado in zip(pendentes, resultados):
+                    if resultado.rejeicao == Rejeicao.CPF_DUPLICADO:
+                        # Pode ser a própria inscrição, gravada antes de a conexão cair;
+                        # com outro nome ou telefone é outra pessoa usando o CPF
+                        numero_vip = _numero_vip_da_inscricao(conn, dados)
+                        if numero_vip is not None:
+                            self._resolver(dados["protocolo"], "confirmado", numero_vip)
+                            continue
+                    if resultado.confirmado:
+                        self._resolver(dados["protocolo"], "confirmado", resultado.numero_vip)
+                    else:
+                        self._resolver(dados["protocolo"], resultado.rejeicao.value)
+            if len(pendentes) < self._lote:
+                return
+            pendentes = self._pendentes()
+
+
+def _numero_vip_da_inscricao(conn, dados):
+    """Número VIP da inscrição já gravada com o mesmo CPF, nome e telefone, ou None."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT numero_vip FROM public.agyte_participantes
+            WHERE evento = %(evento)s AND cpf_normalizado = %(cpf)s
+            AND nome = %(nome)s AND telefone = %(telefone)s
+        """, dados)
+        resultado = cur.fetchone()
+    return resultado[0] if resultado else None
+
+
+@st.cache_resource(show_spinner=False)
+def _iniciar_fila(caminho):
+    return FilaLocal(
+        caminho,
+        intervalo=float(_config("FILA_INTERVALO", 5)),
+        lote=int(_config("FILA_LOTE", 50))
+    ).iniciar()
+
+
+def obter_fila():
+    """Fila local do processo, ou None se FILA_LOCAL estiver vazio."""
+    caminho = _config("FILA_LOCAL", "agyte_fila.sqlite3")
+    if not caminho:
+        return None
+    return _iniciar_fila(caminho)
+
+
+def _ocupadas_conhecidas(evento):
+    """Vagas ocupadas pelos últimos contadores lidos do banco (0 se nunca foram lidos)."""
+    ultima = _ultimas_estatisticas.get(evento)
+    return ultima[0].total if ultima else 0
+
+
+def consultar_protocolo(protocolo):
+    """Como ficou uma inscrição feita na fila local (ResultadoInscricao), ou None
+    se o protocolo não existir ou a fila estiver desligada."""
+    fila = obter_fila()
+    if fila is None or not protocolo:
+        return None
+    return fila.consultar(protocolo)
+
+
+# ==============================
+# CONTADORES AO VIVO (LISTEN/NOTIFY)
+# ==============================
+CANAL_INSCRICOES = "agyte_inscricoes"
+
+# De quantos em quantos segundos a página relê os contadores em memória
+INTERVALO_CONTADORES = float(_config("CONTADORES_INTERVALO", 2))
+
+
+class OuvinteContadores:
+    """Thread única por processo que escuta o canal de inscrições do banco.
+
+    Mantém em memória os contadores de todos os eventos, carregados ao
+    conectar e atualizados a cada notificação (sql/003_notificar_inscricoes.sql).
+    As sessões leem daqui sem tocar no banco.
+    """
+
+    def __init__(self, parametros, espera_maxima=30):
+        self._parametros = parametros
+        self._espera_maxima = espera_maxima
+        self._contadores = {}
+        self._conectado = False
+        self._trava = threading.Lock()
+        self._thread = threading.Thread(target=self._executar, name="agyte-ouvinte", daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def contadores(self, evento):
+        """Últimos contadores conhecidos do evento, ou None se o ouvinte estiver desconectado."""
+        with self._trava:
+            if not self._conectado:
+                return None
+            return self._contadores.get(evento, EstatisticasEvento())
+
+    def atualizar(self, evento, estatisticas):
+        """Aplica um valor novo, ignorando notificações que chegaram fora de ordem."""
+        with self._trava:
+            atual = self._contadores.get(evento)
+            # proximo_numero só cresce; exclusões mantêm o número e baixam emitidos
+            if atual is None or estatisticas.proximo_numero >= atual.proximo_numero:
+                self._contadores[evento] = estatisticas
+
+    def _executar(self):
+        espera = 1
+        while True:
+            try:
+                self._escutar()
+                espera = 1
+            except Exception as e:
+                print(f"Ouvinte de inscrições desconectado: {e}")
+            with self._trava:
+                self._conectado = False
+            time.sleep(espera)
+            espera = min(espera * 2, self._espera_maxima)
+
+    def _escutar(self):
+        conn = psycopg2.connect(**self._parametros, connection_factory=ConexaoAgyte)
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                # LISTEN antes da carga: nada que mude entre as duas se perde
+                cur.execute(f"LISTEN {CANAL_INSCRICOES}")
+                cur.execute("SELECT evento, emitidos, proximo_numero FROM public.agyte_evento_contadores")
+                carga = {evento: EstatisticasEvento(emitidos, proximo) for evento, emitidos, proximo in cur.fetchall()}
+            with self._trava:
+                self._contadores = carga
+                self._conectado = True
+
+            while True:
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    aviso = json.loads(conn.notifies.pop(0).payload)
+                    self.atualizar(aviso["evento"], EstatisticasEvento(aviso["emitidos"], aviso["proximo_numero"]))
+        finally:
+            conn.close()
+
+
+@st.cache_resource(show_spinner=False)
+def _iniciar_ouvinte():
+    return OuvinteContadores(_parametros_conexao()).iniciar()
+
+
+def obter_ouvinte():
+    """Ouvinte de contadores do processo, ou None se desligado em CONTADORES_AO_VIVO."""
+    if str(_config("CONTADORES_AO_VIVO", "1")).lower() in ("0", "false", "nao", "não"):
+        return None
+    return _iniciar_ouvinte()
+
+
+def _atualizar_ouvinte(evento, estatisticas):
+    ouvinte = obter_ouvinte()
+    if ouvinte is not None:
+        ouvinte.atualizar(evento, estatisticas)
+
+
+# ==============================
+# ESTATÍSTICAS E CONSULTAS
+# ==============================
+# Última leitura boa de cada evento, servida enquanto o banco estiver fora
+_ultimas_estatisticas = {}
+
+
+@st.cache_data(ttl=float(_config("ESTATISTICAS_TTL", 3)), show_spinner=False)
+@metricas.DURACAO_DB.cronometrar(operacao="consultar_estatisticas")
+def _consultar_estatisticas(evento):
+    """Uma consulta para os contadores do evento, em cache compartilhado entre sessões.
+
+    Falhas sobem como exceção para que nenhum valor provisório fique em cache.
+    """
+    with conexao(leitura=_ler_da_replica(evento)) as conn:
+        if conn is None:
+            raise ConnectionError("Banco de dados indisponível")
+
+        with conn.cursor() as cur:
+            executar(cur, ("agyte_estatisticas",), dict(evento=evento))
+            resultado = cur.fetchone()
+    return EstatisticasEvento(*resultado) if resultado else EstatisticasEvento()
+
+
+@metricas.DURACAO_DB.cronometrar(operacao="obter_estatisticas")
+def obter_estatisticas(evento="FUNCIONAL"):
+    """Contadores do evento para exibição.
+
+    No PostgreSQL vêm da memória do processo quando o ouvinte de
+    notificações está conectado; senão, do cache de até ESTATISTICAS_TTL
+    segundos.
+    """
+    try:
+        estatisticas = obter_armazenamento().estatisticas(evento)
+    except Exception as e:
+        print(f"Erro ao obter estatísticas: {e}")
+        metricas.ERROS_DB.inc(operacao="obter_estatisticas")
+        # Banco fora do ar: últimos números conhecidos, marcados como desatualizados
+        ultima = _ultimas_estatisticas.get(evento)
+        if ultima is None:
+            return EstatisticasEvento(desatualizado_desde=0)
+        estatisticas, lida_em = ultima
+        return replace(estatisticas, desatualizado_desde=lida_em)
+    _ultimas_estatisticas[evento] = (estatisticas, time.time())
+    return estatisticas
+
+@metricas.DURACAO_DB.cronometrar(operacao="contar_participantes")
+def contar_participantes(evento="FUNCIONAL"):
+    """Total de vagas ocupadas no evento"""
+    try:
+        return obter_armazenamento().estatisticas(evento).total
+    except Exception as e:
+        print(f"Erro ao contar participantes: {e}")
+        metricas.ERROS_DB.inc(operacao="contar_participantes")
+        return 0
+
+@metricas.DURACAO_DB.cronometrar(operacao="contar_por_setor_unidade")
+def contar_por_setor_unidade(evento="FUNCIONAL", setor=None, unidade=None):
+    """Inscrições do evento por (setor, unidade).
+
+    Filtra por setor e/ou unidade quando informados. Devolve
+    {(setor, unidade): total}; o total geral é a soma dos valores.
+    """
+    try:
+        return obter_armazenamento().por_setor_unidade(evento, setor, unidade)
+    except Exception as e:
+        print(f"Erro ao contar por setor/unidade: {e}")
+        metricas.ERROS_DB.inc(operacao="contar_por_setor_unidade")
+        return {}
+
+@metricas.DURACAO_DB.cronometrar(operacao="verificar_cpf_existente")
+def verificar_cpf_existente(cpf, evento="FUNCIONAL"):
+    """Verifica se CPF já está cadastrado no evento"""
+    try:
+        return obter_armazenamento().cpf_existe(evento, normalizar_cpf(cpf))
+    except Exception as e:
+        print(f"Erro ao verificar CPF: {e}")
+        metricas.ERROS_DB.inc(operacao="verificar_cpf_existente")
+        return False
+
+@metricas.DURACAO_DB.cronometrar(operacao="obter_proximo_numero")
+def obter_proximo_numero(evento="FUNCIONAL"):
+    """Próximo número VIP do evento"""
+    try:
+        return obter_armazenamento().estatisticas(evento).proximo_numero
+    except Exception as e:
+        print(f"Erro ao obter próximo número: {e}")
+        metricas.ERROS_DB.inc(operacao="obter_proximo_numero")
+        return 1
+
+
+# ==============================
+# CATÁLOGO DE EVENTOS
+# ==============================
+@dataclass(frozen=True)
+class Evento:
+    """Um evento do catálogo (tabela agyte_eventos)."""
+    codigo: str
+    nome: str
+    capacidade: int
+    data: datetime.date
+    horario: datetime.time
+    endereco: tuple
+
+
+# Usado enquanto o catálogo não pode ser lido do banco
+EVENTO_PADRAO = Evento(
+    codigo="FUNCIONAL",
+    nome="TREINO FUNCIONAL PREMIUM",
+    capacidade=50,
+    data=datetime.date(2026, 1, 30),
+    horario=datetime.time(17, 50),
+    endereco=("Rua Conselheiro Galvão, 77", "Maraponga/Parangaba", "Fortaleza - CE")
+)
+
+_ultimo_catalogo = {}
+
+
+@st.cache_data(ttl=float(_config("CATALOGO_TTL", 300)), show_spinner=False)
+def _carregar_catalogo():
+    """Todos os eventos ativos, em cache compartilhado entre sessões."""
+    return obter_armazenamento().eventos()
+
+
+@metricas.DURACAO_DB.cronometrar(operacao="obter_catalogo")
+def obter_catalogo():
+    """Eventos ativos por código; com o banco fora do ar, a última leitura boa."""
+    try:
+        catalogo = _carregar_catalogo()
+        _ultimo_catalogo.update(catalogo=catalogo)
+        return catalogo
+    except Exception as e:
+        print(f"Erro ao carregar catálogo de eventos: {e}")
+        metricas.ERROS_DB.inc(operacao="obter_catalogo")
+        return _ultimo_catalogo.get("catalogo", {})
+
+
+def obter_evento(codigo=None):
+    """Evento pelo código; sem código (ou código desconhecido), o evento padrão."""
+    catalogo = obter_catalogo()
+    if codigo and codigo.upper() in catalogo:
+        return catalogo[codigo.upper()]
+    padrao = _config("EVENTO_PADRAO", EVENTO_PADRAO.codigo)
+    return catalogo.get(padrao, EVENTO_PADRAO)
+
+
+# ==============================
+# ARMAZENAMENTO
+# ==============================
+class Armazenamento(abc.ABC):
+    """Onde as inscrições ficam gravadas.
+
+    Todas as implementações seguem as mesmas regras de inscrição: capacidade
+    do evento, um CPF por evento e números VIP em sequência sem repetição.
+    Falhas sobem como exceção; as funções públicas do módulo decidem o que
+    mostrar no lugar.
+    """
+
+    def iniciar(self):
+        """Sobe o que o armazenamento precisar em segundo plano."""
+        return self
+
+    @abc.abstractmethod
+    def inscrever(self, dados):
+        """Inscrição atômica; devolve um ResultadoInscricao."""
+
+    @abc.abstractmethod
+    def estatisticas(self, evento):
+        """EstatisticasEvento do evento."""
+
+    @abc.abstractmethod
+    def por_setor_unidade(self, evento, setor=None, unidade=None):
+        """{(setor, unidade): total} do evento, filtrado quando informado."""
+
+    @abc.abstractmethod
+    def cpf_existe(self, evento, cpf):
+        """Se o CPF (já normalizado) está inscrito no evento."""
+
+    @abc.abstractmethod
+    def eventos(self):
+        """Eventos ativos por código."""
+
+
+class ArmazenamentoPostgres(Armazenamento):
+    """PostgreSQL, com pool, disjuntor, réplica de leitura, escritor em grupo,
+    fila local e contadores ao vivo."""
+
+    def iniciar(self):
+        obter_ouvinte()
+        obter_escritor()
+        obter_fila()
+        return self
+
+    def inscrever(self, dados):
+        return _inscrever_postgres(dados)
+
+    def estatisticas(self, evento):
+        ouvinte = obter_ouvinte()
+        estatisticas = ouvinte.contadores(evento) if ouvinte is not None else None
+        if estatisticas is None:
+            estatisticas = _consultar_estatisticas(evento)
+        return estatisticas
+
+    def por_setor_unidade(self, evento, setor=None, unidade=None):
+        with conexao(leitura=_ler_da_replica(evento)) as conn:
+            if conn is None:
+                raise ConnectionError("Banco de dados indisponível")
+
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT setor, unidade, total FROM public.agyte_evento_agregados
+                    WHERE evento = %(evento)s
+                    AND (%(setor)s::text IS NULL OR setor = %(setor)s)
+                    AND (%(unidade)s::text IS NULL OR unidade = %(unidade)s)
+                    AND total > 0
+                """, dict(evento=evento, setor=setor, unidade=unidade))
+                return {(setor, unidade): total for setor, unidade, total in cur.fetchall()}
+
+    def cpf_existe(self, evento, cpf):
+        # Decide inscrição: sempre no primário
+        with conexao() as conn:
+            if conn is None:
+                raise ConnectionError("Banco de dados indisponível")
+
+            with conn.cursor() as cur:
+                executar(cur, ("agyte_cpf_existe",), dict(evento=evento, cpf=cpf))
+                return cur.fetchone()[0]
+
+    def eventos(self):
+        with conexao(leitura=True) as conn:
+            if conn is None:
+                raise ConnectionError("Banco de dados indisponível")
+
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT evento, nome, capacidade, data_evento, horario, endereco
+                    FROM public.agyte_eventos
+                    WHERE ativo
+                """)
+                linhas = cur.fetchall()
+        return {
+            codigo: Evento(codigo, nome, capacidade, data_evento, hora, tuple(endereco.splitlines()))
+            for codigo, nome, capacidade, data_evento, hora, endereco in linhas
+        }
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """Arquivo SQLite embutido, para quiosque/offline e testes sem PostgreSQL.
+
+    Uma conexão por processo protegida por trava; BEGIN IMMEDIATE serializa
+    as inscrições também entre processos que abram o mesmo arquivo.
+    """
+
+    def __init__(self, caminho):
+        self._trava = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS agyte_eventos (
+                evento      TEXT PRIMARY KEY,
+                nome        TEXT NOT NULL,
+                capacidade  INTEGER NOT NULL,
+                data_evento TEXT NOT NULL,
+                horario     TEXT NOT NULL,
+                endereco    TEXT NOT NULL,
+                ativo       INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS agyte_participantes (
+                id              INTEGER PRIMARY KEY,
+                nome            TEXT NOT NULL,
+                cpf_normalizado TEXT NOT NULL,
+                setor           TEXT,
+                unidade         TEXT,
+                telefone        TEXT,
+                numero_vip      INTEGER NOT NULL,
+                evento          TEXT NOT NULL,
+                data_inscricao  REAL NOT NULL,
+                UNIQUE (evento, cpf_normalizado),
+                UNIQUE (evento, numero_vip)
+            );
+            CREATE TABLE IF NOT EXISTS agyte_evento_contadores (
+                evento         TEXT PRIMARY KEY,
+                emitidos       INTEGER NOT NULL DEFAULT 0,
+                proximo_numero INTEGER NOT NULL DEFAULT 1
+            );
+        """)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO agyte_eventos (evento, nome, capacidade, data_evento, horario, endereco) VALUES (?, ?, ?, ?, ?, ?)",
+            (EVENTO_PADRAO.codigo, EVENTO_PADRAO.nome, EVENTO_PADRAO.capacidade, EVENTO_PADRAO.data.isoformat(),
+             EVENTO_PADRAO.horario.strftime("%H:%M"), "\n".join(EVENTO_PADRAO.endereco))
+        )
+
+    def inscrever(self, dados):
+        evento = dados["evento"]
+        with self._trava:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT OR IGNORE INTO agyte_evento_contadores (evento) VALUES (?)", (evento,))
+                emitidos, proximo_numero = self._conn.execute(
+                    "SELECT emitidos, proximo_numero FROM agyte_evento_contadores WHERE evento = ?", (evento,)
+                ).fetchone()
+                if emitidos >= dados["capacidade"]:
+                    resultado = _recusa_esgotado(dados["capacidade"])
+                else:
+                    try:
+                        self._conn.execute("""
+                            INSERT INTO agyte_participantes
+                                (nome, cpf_normalizado, setor, unidade, telefone, numero_vip, evento, data_inscricao)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (dados["nome"], dados["cpf"], dados["setor"], dados["unidade"],
+                              dados["telefone"], proximo_numero, evento, time.time()))
+                    except sqlite3.IntegrityError as e:
+                        # Só o UNIQUE do CPF é recusa; NOT NULL ou número VIP repetido são erro
+                        if "agyte_participantes.cpf_normalizado" not in str(e):
+                            raise
+                        resultado = _recusa_cpf_duplicado()
+                    else:
+                        self._conn.execute(
+                            "UPDATE agyte_evento_contadores SET emitidos = ?, proximo_numero = ? WHERE evento = ?",
+                            (emitidos + 1, proximo_numero + 1, evento)
+                        )
+                        resultado = _confirmacao(proximo_numero)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+        return resultado
+
+    def estatisticas(self, evento):
+        with self._trava:
+            linha = self._conn.execute(
+                "SELECT emitidos, proximo_numero FROM agyte_evento_contadores WHERE evento = ?", (evento,)
+            ).fetchone()
+        return EstatisticasEvento(*linha) if linha else EstatisticasEvento()
+
+    def por_setor_unidade(self, evento, setor=None, unidade=None):
+        with self._trava:
+            linhas = self._conn.execute("""
+                SELECT setor, unidade, COUNT(*) FROM agyte_participantes
+                WHERE evento = :evento
+                AND (:setor IS NULL OR setor = :setor)
+                AND (:unidade IS NULL OR unidade = :unidade)
+                GROUP BY setor, unidade
+            """, dict(evento=evento, setor=setor, unidade=unidade)).fetchall()
+        return {(setor, unidade): total for setor, unidade, total in linhas}
+
+    def cpf_existe(self, evento, cpf):
+        with self._trava:
+            linha = self._conn.execute(
+                "SELECT 1 FROM agyte_participantes WHERE evento = ? AND cpf_normalizado = ?", (evento, cpf)
+            ).fetchone()
+        return linha is not None
+
+    def eventos(self):
+        with self._trava:
+            linhas = self._conn.execute("""
+                SELECT evento, nome, capacidade, data_evento, horario, endereco
+                FROM agyte_eventos
+                WHERE ativo
+            """).fetchall()
+        return {
+            codigo: Evento(codigo, nome, capacidade, datetime.date.fromisoformat(data_evento),
+                           datetime.time.fromisoformat(hora), tuple(endereco.splitlines()))
+            for codigo, nome, capacidade, data_evento, hora, endereco in linhas
+        }
+
+
+class ArmazenamentoMemoria(Armazenamento):
+    """Tudo em memória do processo, para benchmarks e testes de concorrência.
+
+    Some quando o processo termina.
+    """
+
+    def __init__(self, eventos=None):
+        self._trava = threading.Lock()
+        self._eventos = dict(eventos or {EVENTO_PADRAO.codigo: EVENTO_PADRAO})
+        self._contadores = {}     # evento -> EstatisticasEvento
+        self._participantes = {}  # (evento, cpf) -> dados da inscrição com numero_vip
+
+    def inscrever(self, dados):
+        evento = dados["evento"]
+        with self._trava:
+            contadores = self._contadores.get(evento, EstatisticasEvento())
+            if contadores.total >= dados["capacidade"]:
+                return _recusa_esgotado(dados["capacidade"])
+            if (evento, dados["cpf"]) in self._participantes:
+                return _recusa_cpf_duplicado()
+            numero_vip = contadores.proximo_numero
+            self._participantes[(evento, dados["cpf"])] = dict(dados, numero_vip=numero_vip)
+            self._contadores[evento] = EstatisticasEvento(contadores.total + 1, numero_vip + 1)
+        return _confirmacao(numero_vip)
+
+    def estatisticas(self, evento):
+        return self._contadores.get(evento, EstatisticasEvento())
+
+    def por_setor_unidade(self, evento, setor=None, unidade=None):
+        totais = {}
+        with self._trava:
+            for (evento_inscricao, _), dados in self._participantes.items():
+                if evento_inscricao != evento:
+                    continue
+                if (setor is not None and dados["setor"] != setor) or (unidade is not None and dados["unidade"] != unidade):
+                    continue
+                chave = (dados["setor"], dados["unidade"])
+                totais[chave] = totais.get(chave, 0) + 1
+        return totais
+
+    def cpf_existe(self, evento, cpf):
+        return (evento, cpf) in self._participantes
+
+    def eventos(self):
+        return dict(self._eventos)
+
+
+@st.cache_resource(show_spinner=False)
+def _iniciar_armazenamento(tipo):
+    if tipo == "postgres":
+        return ArmazenamentoPostgres()
+    if tipo == "sqlite":
+        return ArmazenamentoSQLite(_config("ARMAZENAMENTO_SQLITE", "agyte.sqlite3"))
+    if tipo == "memoria":
+        return ArmazenamentoMemoria()
+    raise ValueError(f"ARMAZENAMENTO desconhecido: {tipo}")
+
+
+def obter_armazenamento():
+    """Armazenamento do processo, escolhido em ARMAZENAMENTO (postgres, sqlite ou memoria)."""
+    return _iniciar_armazenamento(str(_config("ARMAZENAMENTO", "postgres")).lower())
+
+
+# ==============================
+# TAREFAS DE FUNDO
+# ==============================
+def iniciar_tarefas_de_fundo():
+    """Carrega o catálogo e sobe as threads do armazenamento (no PostgreSQL:
+    ouvinte de contadores, escritor em grupo e reenvio da fila local) e o
+    endpoint /metrics, se METRICAS_PORTA estiver configurada."""
+    obter_catalogo()
+    obter_armazenamento().iniciar()
+    try:
+        metricas.iniciar_servidor(int(_config("METRICAS_PORTA", 0)), _config("METRICAS_HOST", "127.0.0.1"))
+    except OSError as e:
+        print(f"Erro ao abrir o endpoint de métricas: {e}")
@@ -0,0 +1,322 @@
+"""Caminho rápido por HTTP: formulário estático e API JSON de inscrição.
+
+Roda ao lado (ou no lugar) da página do Streamlit, sem websocket nem
+execução de script por visitante, com a mesma validação (agyte_validacao) e
+a mesma camada de dados (agyte_db, inclusive o escritor em grupo, a fila
+local e os contadores em memória):
+
+    python agyte_http.py --porta 8080
+
+    GET  /?evento=CODIGO            formulário (static/inscricao.html)
+    GET  /api/evento?evento=CODIGO  dados do evento, contadores e opções do formulário
+    POST /api/inscricoes            {"nome", "cpf", "telefone", "setor", "unidade", "evento"}
+    GET  /api/inscricoes/PROTOCOLO  como ficou uma inscrição que foi para a fila local
+    GET  /metrics                   métricas do processo (formato texto do Prometheus)
+
+Cada conexão aberta ocupa uma thread, inclusive enquanto fica ociosa entre
+pedidos (até _Api.timeout). O processo atende no máximo HTTP_CONEXOES_MAX
+conexões ao mesmo tempo, na casa das centenas, não dos milhares; as que
+passam disso recebem 503 na hora. Para mais, rode vários processos atrás de
+um proxy.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote
+
+import agyte_metricas as metricas
+from agyte_db import (
+    _config,
+    consultar_protocolo,
+    inserir_participante,
+    obter_estatisticas,
+    obter_evento,
+    iniciar_tarefas_de_fundo,
+    Rejeicao,
+    INTERVALO_CONTADORES,
+)
+from agyte_validacao import (
+    validar_inscricao,
+    SETORES,
+    UNIDADES,
+    formatar_setor,
+    formatar_unidade,
+)
+
+PASTA_ESTATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Arquivos servidos, pelo caminho da URL; lidos uma vez, na subida
+ARQUIVOS = {
+    "/": "inscricao.html",
+    "/static/agyte_campos.js": "agyte_campos.js",
+}
+TIPOS = {".html": "text/html; charset=utf-8", ".js": "text/javascript; charset=utf-8"}
+
+# Corpo máximo de um POST; uma inscrição tem poucas centenas de bytes
+TAMANHO_MAXIMO = 8 * 1024
+
+# Status HTTP do POST por situação da inscrição; as recusas são 409
+STATUS_INSCRICAO = {"confirmada": 201, "pendente": 202, "erro": 503}
+
+# Campos do corpo do POST; todos texto
+CAMPOS = ("nome", "cpf", "telefone", "setor", "unidade", "evento")
+
+EVENTO_DESCONHECIDO = {"status": "evento_desconhecido", "mensagem": "Evento não encontrado."}
+
+# Conexões atendidas ao mesmo tempo; cada uma ocupa uma thread
+CONEXOES_MAX = int(_config("HTTP_CONEXOES_MAX", 256))
+
+
+# ==============================
+# REGRAS DA API
+# ==============================
+def _evento(codigo):
+    """Evento pelo código (sem código, o padrão), ou None se o código não existir."""
+    evento = obter_evento(codigo)
+    if codigo and evento.codigo != codigo.upper():
+        return None
+    return evento
+
+
+def dados_evento(evento):
+    """Evento, contadores e opções do formulário, como a página mostra."""
+    estatisticas = obter_estatisticas(evento.codigo)
+    return {
+        "evento": {
+            "codigo": evento.codigo,
+            "nome": evento.nome,
+            "capacidade": evento.capacidade,
+            "data": evento.data.isoformat(),
+            "horario": evento.horario.strftime("%H:%M"),
+            "endereco": list(evento.endereco),
+        },
+        "estatisticas": {
+            "total": estatisticas.total,
+            "vagas": max(evento.capacidade - estatisticas.total, 0),
+            "desatualizado": estatisticas.desatualizado_desde is not None,
+        },
+        "setores": list(SETORES),
+        "unidades": list(UNIDADES),
+    }
+
+
+def inscrever(pedido):
+    """Valida e grava uma inscrição vinda da API; devolve (status HTTP, corpo JSON)."""
+    if any(not isinstance(pedido.get(campo, ""), str) for campo in CAMPOS):
+        metricas.ENVIOS.inc(resultado="invalido")
+        return 400, {"status": "invalida", "mensagem": "Os campos devem ser texto."}
+    evento = _evento(pedido.get("evento", ""))
+    if evento is None:
+        metricas.ENVIOS.inc(resultado="invalido")
+        return 422, EVENTO_DESCONHECIDO
+    nome, cpf, telefone, erro = validar_inscricao(
+        pedido.get("nome", ""), pedido.get("cpf", ""), pedido.get("telefone", "")
+    )
+    setor = pedido.get("setor", "")
+    unidade = pedido.get("unidade", "")
+    if not erro and (setor not in SETORES or unidade not in UNIDADES):
+        erro = "Escolha o setor e a unidade!"
+    if erro:
+        metricas.ENVIOS.inc(resultado="invalido")
+        return 400, {"status": "invalida", "mensagem": erro}
+
+    metricas.ENVIOS.inc(resultado="processado")
+    resultado = inserir_participante(
+        nome=nome,
+        cpf=cpf,
+        setor=formatar_setor(setor),
+        unidade=formatar_unidade(unidade),
+        telefone=telefone,
+        evento=evento.codigo,
+        capacidade=evento.capacidade
+    )
+    corpo = corpo_resultado(resultado)
+    if corpo["status"] == "confirmada":
+        corpo["capacidade"] = evento.capacidade
+    return STATUS_INSCRICAO.get(corpo["status"], 409), corpo
+
+
+def corpo_resultado(resultado):
+    """Corpo JSON de um ResultadoInscricao, na inscrição e na consulta de protocolo."""
+    if resultado.pendente:
+        # Banco fora do ar: inscrição na fila local, número VIP sai depois
+        return {"status": "pendente", "protocolo": resultado.protocolo, "mensagem": resultado.mensagem}
+    if resultado.confirmado:
+        return {"status": "confirmada", "numero_vip": resultado.numero_vip, "mensagem": resultado.mensagem}
+    if resultado.rejeicao == Rejeicao.ERRO:
+        print(f"Erro na inscrição pela API: {resultado.mensagem}")
+        return {"status": "erro",
+                "mensagem": "Não foi possível concluir a inscrição agora. Tente de novo em instantes."}
+    return {"status": resultado.rejeicao.value, "mensagem": resultado.mensagem}
+
+
+# ==============================
+# SERVIDOR
+# ==============================
+def carregar_arquivos():
+    """Conteúdo, tipo e ETag de cada arquivo servido."""
+    carregados = {}
+    for caminho, nome in ARQUIVOS.items():
+        with open(os.path.join(PASTA_ESTATICA, nome), "rb") as arquivo:
+            corpo = arquivo.read()
+        etag = '"' + hashlib.sha256(corpo).hexdigest()[:16] + '"'
+        carregados[caminho] = (corpo, TIPOS[os.path.splitext(nome)[1]], etag)
+    return carregados
+
+
+class _Api(BaseHTTPRequestHandler):
+    # Conexões persistentes: o navegador busca página, script e contadores na mesma
+    protocol_version = "HTTP/1.1"
+    server_version = "agyte"
+    # Conexão parada (ociosa ou mandando o pedido aos poucos) é fechada depois
+    # disso (s), em vez de prender uma thread do servidor para sempre
+    timeout = 15
+    arquivos = {}
+
+    def do_GET(self):
+        caminho, _, consulta = self.path.partition("?")
+        if caminho in self.arquivos:
+            self._arquivo(*self.arquivos[caminho])
+        elif caminho == "/api/evento":
+            evento = _evento(parse_qs(consulta).get("evento", [""])[0])
+            if evento is None:
+                self._json(404, EVENTO_DESCONHECIDO)
+            else:
+                # Os contadores mudam a cada inscrição; um proxy pode segurar alguns segundos
+                self._json(200, dados_evento(evento), cache=f"public, max-age={int(INTERVALO_CONTADORES)}")
+        elif caminho.startswith("/api/inscricoes/"):
+            resultado = consultar_protocolo(unquote(caminho[len("/api/inscricoes/"):]))
+            if resultado is None:
+                self._json(404, {"status": "nao_encontrado", "mensagem": "Protocolo não encontrado."})
+            else:
+                self._json(200, corpo_resultado(resultado))
+        elif caminho == "/metrics":
+            self._responder(200, metricas.formatar().encode(), "text/plain; version=0.0.4; charset=utf-8",
+                            cache="no-store")
+        else:
+            self._json(404, {"status": "nao_encontrado"})
+
+    def do_POST(self):
+        if self.path.partition("?")[0] != "/api/inscricoes":
+            self._json(404, {"status": "nao_encontrado"})
+            return
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if not 0 < tamanho <= TAMANHO_MAXIMO:
+            # Corpo não lido: a conexão não pode ser reaproveitada
+            self.close_connection = True
+            self._json(413 if tamanho > TAMANHO_MAXIMO else 400,
+                       {"status": "invalida", "mensagem": "Pedido sem corpo ou grande demais."})
+            return
+        try:
+            pedido = json.loads(self.rfile.read(tamanho))
+        except ValueError:
+            pedido = None
+        if not isinstance(pedido, dict):
+            self._json(400, {"status": "invalida", "mensagem": "O corpo deve ser um objeto JSON."})
+            return
+        self._json(*inscrever(pedido))
+
+    def _arquivo(self, corpo, tipo, etag):
+        if self.headers.get("If-None-Match") == etag:
+            self._responder(304, b"", None, etag=etag)
+        else:
+            self._responder(200, corpo, tipo, etag=etag)
+
+    def _json(self, status, corpo, cache="no-store"):
+        self._responder(status, json.dumps(corpo, ensure_ascii=False).encode(),
+                        "application/json; charset=utf-8", cache=cache)
+
+    def _responder(self, status, corpo, tipo, etag=None, cache="public, max-age=60"):
+        self.send_response(status)
+        if tipo:
+            self.send_header("Content-Type", tipo)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _resposta_lotado():
+    """Resposta 503 crua, mandada sem passar pelo handler (nem ocupar thread)."""
+    corpo = json.dumps({"status": "erro", "mensagem": "Muitos acessos agora. Tente de novo em instantes."},
+                       ensure_ascii=False).encode()
+    return (
+        "HTTP/1.1 503 Service Unavailable\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        "Retry-After: 1\r\n"
+        "Cache-Control: no-store\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode() + corpo
+
+
+class ServidorHttp(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fila de conexões do socket: aguenta a rajada da abertura das inscrições
+    request_queue_size = 1024
+    lotado = _resposta_lotado()
+
+    def __init__(self, endereco, handler, conexoes_max=CONEXOES_MAX):
+        self.vagas = threading.BoundedSemaphore(conexoes_max)
+        super().__init__(endereco, handler)
+
+    def process_request(self, request, client_address):
+        if not self.vagas.acquire(blocking=False):
+            # Sem thread livre: recusa já, em vez de criar mais uma
+            metricas.HTTP_RECUSADAS.inc()
+            try:
+                request.sendall(self.lotado)
+                # Descarta o pedido que já chegou; fechar com dados não lidos
+                # manda RST e o cliente pode perder o 503
+                request.setblocking(False)
+                request.recv(TAMANHO_MAXIMO)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self.vagas.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.vagas.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--porta", type=int, default=int(_config("HTTP_PORTA", 8080)),
+                        help="porta (padrão: HTTP_PORTA ou 8080)")
+    parser.add_argument("--host", default=_config("HTTP_HOST", "0.0.0.0"),
+                        help="endereço (padrão: HTTP_HOST ou 0.0.0.0)")
+    args = parser.parse_args()
+
+    iniciar_tarefas_de_fundo()
+    _Api.arquivos = carregar_arquivos()
+    servidor = ServidorHttp((args.host, args.porta), _Api)
+    print(f"API de inscrição em http://{args.host}:{args.porta}/")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
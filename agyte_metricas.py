@@ -0,0 +1,205 @@
+import threading
+import time
+from contextlib import ContextDecorator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==============================
+# MÉTRICAS (FORMATO TEXTO DO PROMETHEUS)
+# ==============================
+# Limites dos histogramas, em segundos
+LIMITES_PADRAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_REGISTRO = []
+
+
+def _rotulos_texto(nomes, valores, extra=""):
+    pares = [f'{nome}="{valor}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor):
+    return repr(float(valor)) if valor != int(valor) else str(int(valor))
+
+
+class Contador:
+    """Contador que só cresce, com rótulos opcionais."""
+
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._trava = threading.Lock()
+        _REGISTRO.append(self)
+
+    def inc(self, valor=1, **rotulos):
+        chave = tuple(str(rotulos[nome]) for nome in self.rotulos)
+        with self._trava:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def linhas(self):
+        with self._trava:
+            valores = sorted(self._valores.items())
+        for chave, valor in valores:
+            yield f"{self.nome}{_rotulos_texto(self.rotulos, chave)} {_numero(valor)}"
+
+
+class _Cronometro(ContextDecorator):
+    def __init__(self, histograma, rotulos):
+        self._histograma = histograma
+        self._rotulos = rotulos
+
+    def _recreate_cm(self):
+        # Como decorador, cada chamada (e cada thread) mede com o seu próprio início
+        return _Cronometro(self._histograma, self._rotulos)
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self._histograma.observar(time.perf_counter() - self._inicio, **self._rotulos)
+        return False
+
+
+class Histograma:
+    """Distribuição de durações (s) em faixas acumuladas, com soma e contagem."""
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_PADRAO):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(limites)
+        self._series = {}  # rótulos -> [contagens por faixa..., soma, total]
+        self._trava = threading.Lock()
+        _REGISTRO.append(self)
+
+    def observar(self, valor, **rotulos):
+        chave = tuple(str(rotulos[nome]) for nome in self.rotulos)
+        with self._trava:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [0] * (len(self.limites) + 2)
+            for indice, limite in enumerate(self.limites):
+                if valor <= limite:
+                    serie[indice] += 1
+                    break
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def cronometrar(self, **rotulos):
+        """Mede um bloco (`with`) ou cada chamada de uma função (decorador)."""
+        return _Cronometro(self, rotulos)
+
+    def linhas(self):
+        with self._trava:
+            series = sorted((chave, list(serie)) for chave, serie in self._series.items())
+        for chave, serie in series:
+            acumulado = 0
+            for limite, contagem in zip(self.limites, serie):
+                acumulado += contagem
+                le = _rotulos_texto(self.rotulos, chave, f'le="{_numero(limite)}"')
+                yield f"{self.nome}_bucket{le} {acumulado}"
+            infinito = _rotulos_texto(self.rotulos, chave, 'le="+Inf"')
+            yield f"{self.nome}_bucket{infinito} {serie[-1]}"
+            yield f"{self.nome}_sum{_rotulos_texto(self.rotulos, chave)} {_numero(serie[-2])}"
+            yield f"{self.nome}_count{_rotulos_texto(self.rotulos, chave)} {serie[-1]}"
+
+
+class Fases:
+    """Cronometra trechos seguidos de um script: cada marcar() fecha o trecho
+    desde a marca anterior."""
+
+    def __init__(self, histograma, rotulo="fase"):
+        self._histograma = histograma
+        self._rotulo = rotulo
+        self._inicio = self._ultima = time.perf_counter()
+
+    def marcar(self, fase):
+        agora = time.perf_counter()
+        self._histograma.observar(agora - self._ultima, **{self._rotulo: fase})
+        self._ultima = agora
+
+    def concluir(self, fase="total"):
+        self._histograma.observar(time.perf_counter() - self._inicio, **{self._rotulo: fase})
+
+
+def formatar():
+    """Todas as métricas do processo no formato texto do Prometheus."""
+    saida = []
+    for metrica in _REGISTRO:
+        saida.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+        saida.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+        saida.extend(metrica.linhas())
+    return "\n".join(saida) + "\n"
+
+
+# ==============================
+# MÉTRICAS DO APP
+# ==============================
+DURACAO_DB = Histograma(
+    "agyte_db_duracao_segundos", "Duração das funções de acesso a dados.", ("operacao",))
+ESPERA_CONEXAO = Histograma(
+    "agyte_db_espera_conexao_segundos", "Tempo para obter uma conexão do pool (inclui abrir conexões novas).", ("pool",))
+ERROS_DB = Contador(
+    "agyte_db_erros_total", "Erros de banco por operação.", ("operacao",))
+INSCRICOES = Contador(
+    "agyte_inscricoes_total", "Inscrições por resultado (confirmada, pendente, esgotado, cpf_duplicado, erro).", ("resultado",))
+RENDER = Histograma(
+    "agyte_render_duracao_segundos", "Duração de cada fase da renderização da página.", ("fase",))
+RERUNS = Contador(
+    "agyte_reruns_total", "Execuções do script da página (visitas e reruns).")
+ENVIOS = Contador(
+    "agyte_envios_total", "Envios do formulário: invalido (barrado na validação) ou processado (foi para a inscrição).", ("resultado",))
+SQL_DURACAO = Histograma(
+    "agyte_sql_duracao_segundos", "Duração de cada instrução SQL, pelo nome da consulta e a função que chamou.", ("consulta", "funcao"))
+SQL_LINHAS = Contador(
+    "agyte_sql_linhas_total", "Linhas devolvidas ou alteradas pelas instruções SQL.", ("consulta",))
+SQL_LENTAS = Contador(
+    "agyte_sql_lentas_total", "Instruções SQL acima de SQL_LENTA_MS.", ("consulta",))
+SQL_ERROS = Contador(
+    "agyte_sql_erros_total", "Instruções SQL que falharam, pelo nome da consulta e o tipo do erro.", ("consulta", "erro"))
+HTTP_RECUSADAS = Contador(
+    "agyte_http_recusadas_total", "Conexões da API HTTP recusadas com 503 por passar de HTTP_CONEXOES_MAX.")
+
+
+# ==============================
+# SERVIDOR /metrics
+# ==============================
+class _Metricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corpo = formatar().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+_servidor = {}
+_trava_servidor = threading.Lock()
+
+
+def iniciar_servidor(porta, host="127.0.0.1"):
+    """Sobe (uma vez por processo) o endpoint GET /metrics numa thread. Porta 0 desliga."""
+    if not porta:
+        return None
+    with _trava_servidor:
+        if "http" not in _servidor:
+            servidor = ThreadingHTTPServer((host, porta), _Metricas)
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, name="agyte-metricas", daemon=True).start()
+            _servidor["http"] = servidor
+        return _servidor["http"]
@@ -0,0 +1,79 @@
+# ==============================
+# FUNÇÕES DE FORMATAÇÃO E VALIDAÇÃO
+# ==============================
+# As mesmas regras rodam no navegador (static/agyte_campos.js) para barrar o
+# envio malformado antes de ele sair da página; as daqui são a palavra final.
+def formatar_cpf(cpf):
+    """Remove caracteres não numéricos do CPF"""
+    if not cpf:
+        return ""
+    return ''.join(filter(str.isdigit, cpf))
+
+def formatar_telefone(telefone):
+    """Remove caracteres não numéricos do telefone"""
+    if not telefone:
+        return ""
+    return ''.join(filter(str.isdigit, telefone))
+
+# Opções do formulário (a página e a API HTTP aceitam as mesmas)
+SETORES = (
+    "💻 TI - TECNOLOGIA DA INFORMAÇÃO",
+    "📊 COMERCIAL",
+    "🏭 PRODUÇÃO",
+    "💰 FINANCEIRO",
+    "👨‍💻 TI - DESENVOLVIMENTO",
+    "👔 DIRETORIA",
+    "🚪 PORTARIA",
+    "🧹 SERVIÇOS GERAIS",
+    "🎯 MARKETING",
+    "📞 ATENDIMENTO",
+    "📦 LOGÍSTICA",
+    "⚙️ MANUTENÇÃO",
+    "🎓 RECURSOS HUMANOS",
+    "📋 QUALIDADE",
+    "🏢 ADMINISTRATIVO",
+    "🔍 OUTROS",
+)
+
+UNIDADES = ("🏢 DILADY", "💖 FINNA", "❤️ LOVE")
+
+def formatar_setor(setor):
+    """Setor como é gravado: o trecho antes do hífen, ou a primeira palavra"""
+    return setor.split("-")[0].strip() if "-" in setor else setor.split(" ")[0]
+
+def formatar_unidade(unidade):
+    """Unidade como é gravada, sem o emoji"""
+    return unidade.replace("🏢", "").replace("💖", "").replace("❤️", "").strip()
+
+def cpf_valido(cpf):
+    """11 dígitos, não todos iguais, com os dois dígitos verificadores (módulo 11) certos"""
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    digitos = [int(d) for d in cpf]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos[:tamanho]))
+        if soma * 10 % 11 % 10 != digitos[tamanho]:
+            return False
+    return True
+
+def validar_inscricao(nome, cpf, telefone):
+    """Limpa os campos do formulário e confere as regras.
+
+    Devolve (nome, cpf, telefone, erro): os campos limpos e a mensagem para o
+    participante, ou erro None quando está tudo certo.
+    """
+    nome_limpo = nome.strip().upper() if nome else ""
+    cpf_limpo = formatar_cpf(cpf)
+    telefone_limpo = formatar_telefone(telefone)
+
+    if not nome_limpo or not cpf_limpo or not telefone_limpo:
+        erro = "Preencha todos os campos!"
+    elif len(cpf_limpo) != 11:
+        erro = f"CPF deve ter 11 números! Você digitou {len(cpf_limpo)}."
+    elif not cpf_valido(cpf_limpo):
+        erro = "CPF inválido! Confira os números."
+    elif len(telefone_limpo) < 10:
+        erro = f"Telefone deve ter pelo menos 10 números! Você digitou {len(telefone_limpo)}."
+    else:
+        erro = None
+    return nome_limpo, cpf_limpo, telefone_limpo, erro
@@ -0,0 +1,201 @@
+"""Teste de carga do fluxo de inscrição.
+
+Simula muitas sessões preenchendo e enviando o formulário ao mesmo tempo e
+mede vazão, latência (p50/p95/p99), conexões abertas no banco e se alguma
+inscrição passou da capacidade ou repetiu número VIP.
+
+    python bench/carga.py --sessoes 500 --concorrencia 100
+    ARMAZENAMENTO=memoria python bench/carga.py --modo direto --sessoes 5000
+
+--modo app roda a página de verdade com o AppTest do Streamlit, uma sessão
+por usuário simulado. O AppTest não roda duas páginas ao mesmo tempo no mesmo
+processo, então as sessões simultâneas ficam em processos separados (cada um
+com o seu pool) e o armazenamento precisa ser compartilhado: postgres ou
+sqlite. --modo direto chama inserir_participante em threads de um processo
+só, como o servidor do Streamlit faz, e mede só a camada de dados; aceita
+também ARMAZENAMENTO=memoria.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import agyte_db  # noqa: E402
+
+APP = os.path.join(RAIZ, "agyte_se_app.py")
+
+
+def gerar_cpf(gerador):
+    """CPF com dígitos verificadores válidos."""
+    digitos = [gerador.randrange(10) for _ in range(9)]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos))
+        digitos.append(soma * 10 % 11 % 10)
+    return "".join(map(str, digitos))
+
+
+def percentil(valores, p):
+    if not valores:
+        return float("nan")
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class MonitorConexoes:
+    """Amostra o número de conexões abertas no banco enquanto a carga roda."""
+
+    def __init__(self, intervalo=0.05):
+        self._intervalo = intervalo
+        self._parar = threading.Event()
+        self.amostras = []
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def _executar(self):
+        import psycopg2
+        conn = psycopg2.connect(**agyte_db._parametros_conexao())
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                while not self._parar.is_set():
+                    # Exclui a própria conexão do monitor
+                    cur.execute("SELECT count(*) - 1 FROM pg_stat_activity WHERE datname = current_database()")
+                    self.amostras.append(cur.fetchone()[0])
+                    self._parar.wait(self._intervalo)
+        finally:
+            conn.close()
+
+
+def sessao_app(indice, cpf, evento):
+    """Abre a página, preenche o formulário e envia, como um visitante."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    if evento:
+        at.query_params["evento"] = evento
+    at.run()
+    at.text_input(key="campo_nome").input(f"Participante {indice}")
+    at.text_input(key="campo_cpf").input(cpf)
+    at.text_input(key="campo_telefone").input("85999990000")
+    at.button[0].click()
+    inicio = time.perf_counter()
+    at.run()
+    latencia = time.perf_counter() - inicio
+
+    estado = at.session_state
+    if estado["mostrar_caixa_sucesso"]:
+        return latencia, estado["numero_vip_sucesso"], estado["protocolo_sucesso"], None
+    return latencia, None, None, estado["mensagem_erro"]
+
+
+def sessao_direta(indice, cpf, evento):
+    """Só a chamada à camada de dados, sem a página."""
+    inicio = time.perf_counter()
+    resultado = agyte_db.inserir_participante(
+        nome=f"Participante {indice}", cpf=cpf, setor="TI", unidade="SEDE",
+        telefone="85999990000", evento=evento.codigo, capacidade=evento.capacidade
+    )
+    latencia = time.perf_counter() - inicio
+    erro = None if resultado.confirmado or resultado.pendente else resultado.mensagem
+    return latencia, resultado.numero_vip, resultado.protocolo, erro
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", type=int, default=200, help="usuários simulados (padrão: 200)")
+    parser.add_argument("--concorrencia", type=int, default=50, help="sessões enviando ao mesmo tempo (padrão: 50)")
+    parser.add_argument("--modo", choices=("app", "direto"), default="app")
+    parser.add_argument("--evento", help="código do evento (padrão: EVENTO_PADRAO)")
+    parser.add_argument("--duplicados", type=float, default=0.1, help="fração de envios com CPF repetido (padrão: 0.1)")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.modo == "app" and str(agyte_db._config("ARMAZENAMENTO", "postgres")).lower() == "memoria":
+        parser.error("--modo app roda em vários processos: use ARMAZENAMENTO=postgres ou sqlite")
+
+    gerador = random.Random(args.semente)
+    evento = agyte_db.obter_evento(args.evento)
+    antes = agyte_db.obter_estatisticas(evento.codigo)
+
+    cpfs = []
+    for _ in range(args.sessoes):
+        if cpfs and gerador.random() < args.duplicados:
+            cpfs.append(gerador.choice(cpfs))
+        else:
+            cpfs.append(gerar_cpf(gerador))
+
+    postgres = isinstance(agyte_db.obter_armazenamento(), agyte_db.ArmazenamentoPostgres)
+    monitor = MonitorConexoes().iniciar() if postgres else None
+
+    indices = range(args.sessoes)
+    inicio = time.perf_counter()
+    if args.modo == "app":
+        # O AppTest executa a página como __main__ dentro de cada processo, então
+        # a função vai por referência ao módulo (carga), não a __main__. spawn:
+        # este processo já tem threads (ouvinte, escritor) que o fork copiaria pela metade
+        import carga
+        with ProcessPoolExecutor(max_workers=args.concorrencia, mp_context=get_context("spawn")) as executor:
+            resultados = list(executor.map(carga.sessao_app, indices, cpfs, [evento.codigo] * args.sessoes))
+    else:
+        with ThreadPoolExecutor(max_workers=args.concorrencia) as executor:
+            resultados = list(executor.map(sessao_direta, indices, cpfs, [evento] * args.sessoes))
+    duracao = time.perf_counter() - inicio
+
+    if monitor is not None:
+        monitor.parar()
+
+    latencias = [latencia for latencia, _, _, _ in resultados]
+    numeros = [numero for _, numero, _, _ in resultados if numero]
+    pendentes = [protocolo for _, _, protocolo, _ in resultados if protocolo]
+    erros = {}
+    for _, _, _, erro in resultados:
+        if erro:
+            erros[erro] = erros.get(erro, 0) + 1
+
+    depois = agyte_db.obter_armazenamento().estatisticas(evento.codigo)
+    vagas = evento.capacidade - antes.total
+    repetidos = len(numeros) - len(set(numeros))
+    reusados = [numero for numero in numeros if numero < antes.proximo_numero]
+
+    print(f"armazenamento      {type(agyte_db.obter_armazenamento()).__name__}, modo {args.modo}")
+    print(f"evento             {evento.codigo} (capacidade {evento.capacidade}, {antes.total} já inscritos antes)")
+    print(f"sessões            {args.sessoes} ({args.concorrencia} simultâneas) em {duracao:.2f}s")
+    print(f"vazão              {args.sessoes / duracao:.1f} sessões/s")
+    print(f"latência do envio  p50 {percentil(latencias, 50) * 1000:.1f}ms  "
+          f"p95 {percentil(latencias, 95) * 1000:.1f}ms  p99 {percentil(latencias, 99) * 1000:.1f}ms  "
+          f"máx {max(latencias) * 1000:.1f}ms")
+    if monitor is not None and monitor.amostras:
+        print(f"conexões no banco  máx {max(monitor.amostras)}, média {sum(monitor.amostras) / len(monitor.amostras):.1f}")
+    else:
+        print("conexões no banco  n/d (armazenamento sem servidor)")
+    print(f"confirmadas        {len(numeros)} (vagas livres antes: {vagas})")
+    print(f"pendentes na fila  {len(pendentes)}")
+    for mensagem, total in sorted(erros.items(), key=lambda item: -item[1]):
+        print(f"recusadas          {total} × {mensagem}")
+
+    problemas = []
+    if len(numeros) > vagas or depois.total > evento.capacidade:
+        problemas.append(f"CAPACIDADE EXCEDIDA: {depois.total}/{evento.capacidade}")
+    if repetidos or reusados:
+        problemas.append(f"NÚMERO VIP REPETIDO: {repetidos} na carga, {len(reusados)} já emitidos antes")
+    for problema in problemas:
+        print(problema)
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Micro-benchmarks das funções de acesso a dados contra tabelas sintéticas.
+
+Para cada tamanho de tabela (padrão: 1 mil, 100 mil e 10 milhões de linhas,
+espalhadas por --eventos eventos) mede contar_participantes,
+verificar_cpf_existente, obter_proximo_numero e inserir_participante, e
+grava o resultado em JSON para comparar entre commits.
+
+    python bench/micro.py
+    python bench/micro.py --tamanhos 1000 100000 --comparar bench/resultados/micro-abc1234.json
+
+Roda contra o PostgreSQL configurado (DB_HOST etc.), que deve ser um banco
+local de teste: as linhas sintéticas usam eventos BENCH_nnnn e são apagadas
+no fim (a não ser com --manter). A carga desliga os triggers da sessão
+(session_replication_role), o que exige superusuário, e recalcula
+contadores e agregados de uma vez.
+
+Os caches do processo (contadores ao vivo, cache de estatísticas, escritor
+em grupo) ficam desligados por padrão para medir a consulta em si.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+for chave, valor in (("CONTADORES_AO_VIVO", "0"), ("ESCRITOR_EM_GRUPO", "0"), ("FILA_LOCAL", "")):
+    os.environ.setdefault(chave, valor)
+
+import psycopg2  # noqa: E402
+
+import agyte_db  # noqa: E402
+
+PREFIXO = "BENCH_"
+
+
+def codigo_evento(indice):
+    return f"{PREFIXO}{indice:04d}"
+
+
+def cpf_sintetico(indice):
+    return f"{indice:011d}"
+
+
+def conectar_carga():
+    conn = psycopg2.connect(**agyte_db._parametros_conexao())
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        # Sem triggers por linha: contadores e agregados são recalculados no fim
+        cur.execute("SET session_replication_role = replica")
+    return conn
+
+
+def carregar(conn, de, ate, eventos):
+    """Insere as linhas sintéticas de índice [de, ate) e recalcula contadores e agregados."""
+    with conn.cursor() as cur:
+        # Com session_replication_role = replica o trigger que preenche
+        # cpf_normalizado não dispara: a carga grava a coluna ela mesma
+        cur.execute("""
+            INSERT INTO public.agyte_participantes
+                (nome, cpf, cpf_normalizado, setor, unidade, telefone, numero_vip, evento)
+            SELECT 'BENCH ' || i, lpad(i::text, 11, '0'), lpad(i::text, 11, '0'),
+                   'SETOR ' || (i %% 7), 'UNIDADE ' || (i %% 3), '85999990000',
+                   i / %(eventos)s + 1, %(prefixo)s || lpad((i %% %(eventos)s)::text, 4, '0')
+            FROM generate_series(%(de)s::bigint, %(ate)s::bigint - 1) AS i
+        """, dict(de=de, ate=ate, eventos=eventos, prefixo=PREFIXO))
+        recalcular(cur)
+        cur.execute("VACUUM ANALYZE public.agyte_participantes")
+
+
+def recalcular(cur):
+    filtro = dict(padrao=PREFIXO.replace("_", r"\_") + "%")
+    cur.execute("""
+        INSERT INTO public.agyte_evento_contadores (evento, emitidos, proximo_numero)
+        SELECT evento, COUNT(*), MAX(numero_vip) + 1
+        FROM public.agyte_participantes
+        WHERE evento LIKE %(padrao)s
+        GROUP BY evento
+        ON CONFLICT (evento) DO UPDATE
+        SET emitidos = EXCLUDED.emitidos, proximo_numero = EXCLUDED.proximo_numero
+    """, filtro)
+    cur.execute("DELETE FROM public.agyte_evento_agregados WHERE evento LIKE %(padrao)s", filtro)
+    cur.execute("""
+        INSERT INTO public.agyte_evento_agregados (evento, setor, unidade, total)
+        SELECT evento, COALESCE(setor, ''), COALESCE(unidade, ''), COUNT(*)
+        FROM public.agyte_participantes
+        WHERE evento LIKE %(padrao)s
+        GROUP BY 1, 2, 3
+    """, filtro)
+
+
+def limpar(conn):
+    filtro = dict(padrao=PREFIXO.replace("_", r"\_") + "%")
+    with conn.cursor() as cur:
+        for tabela in ("agyte_participantes", "agyte_evento_contadores", "agyte_evento_agregados"):
+            cur.execute(f"DELETE FROM public.{tabela} WHERE evento LIKE %(padrao)s", filtro)
+
+
+# Chamadas de aquecimento antes das medidas, com argumentos próprios
+AQUECIMENTO = 10
+
+
+def medir(funcao, argumentos, aquecimento=AQUECIMENTO):
+    """Tempo de cada chamada, em microssegundos.
+
+    Os primeiros `aquecimento` argumentos só aquecem e não são medidos: repeti-los
+    na medida faria, por exemplo, as primeiras inscrições voltarem como CPF repetido.
+    """
+    for args in argumentos[:aquecimento]:
+        funcao(*args)
+    tempos = []
+    for args in argumentos[aquecimento:]:
+        inicio = time.perf_counter_ns()
+        funcao(*args)
+        tempos.append((time.perf_counter_ns() - inicio) / 1000)
+    return tempos
+
+
+def resumo(tempos):
+    ordenados = sorted(tempos)
+
+    def percentil(p):
+        return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+    return dict(
+        n=len(ordenados),
+        media_us=round(sum(ordenados) / len(ordenados), 1),
+        p50_us=round(percentil(50), 1),
+        p95_us=round(percentil(95), 1),
+        p99_us=round(percentil(99), 1),
+        ops_s=round(len(ordenados) / (sum(ordenados) / 1e6), 1),
+    )
+
+
+def sem_cache(funcao):
+    """A função pública, sempre indo ao banco (descarta o cache de estatísticas antes)."""
+    def chamar(*args):
+        agyte_db._consultar_estatisticas.clear()
+        return funcao(*args)
+    return chamar
+
+
+def medir_tamanho(tamanho, eventos, repeticoes, gerador, proximo_cpf):
+    """Mede as quatro funções com `tamanho` linhas carregadas."""
+    chamadas = repeticoes + AQUECIMENTO
+    sorteio = [codigo_evento(gerador.randrange(eventos)) for _ in range(chamadas)]
+    cpfs = []
+    for i, evento in enumerate(sorteio):
+        if i % 2:
+            # Metade existe na tabela, no evento em que `carregar` pôs cada CPF
+            indice = gerador.randrange(tamanho)
+            cpfs.append((cpf_sintetico(indice), codigo_evento(indice % eventos)))
+        else:
+            cpfs.append((cpf_sintetico(proximo_cpf + i), evento))
+    novos = [
+        ("BENCH NOVO", cpf_sintetico(proximo_cpf + chamadas + i), "SETOR 0", "UNIDADE 0", "85999990000",
+         evento, tamanho + chamadas * 2)
+        for i, evento in enumerate(sorteio)
+    ]
+    return {
+        "contar_participantes": resumo(medir(sem_cache(agyte_db.contar_participantes), [(e,) for e in sorteio])),
+        "verificar_cpf_existente": resumo(medir(agyte_db.verificar_cpf_existente, cpfs)),
+        "obter_proximo_numero": resumo(medir(sem_cache(agyte_db.obter_proximo_numero), [(e,) for e in sorteio])),
+        "inserir_participante": resumo(medir(agyte_db.inserir_participante, novos)),
+    }
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "desconhecido"
+
+
+def comparar(atual, arquivo):
+    with open(arquivo) as f:
+        anterior = json.load(f)
+    print(f"\ncomparado com {anterior['commit']} ({arquivo}), p50:")
+    for tamanho, funcoes in atual["resultados"].items():
+        for funcao, medidas in funcoes.items():
+            base = anterior["resultados"].get(tamanho, {}).get(funcao)
+            if not base:
+                continue
+            variacao = (medidas["p50_us"] - base["p50_us"]) / base["p50_us"] * 100
+            print(f"  {int(tamanho):>10,} {funcao:<24} {base['p50_us']:>9.1f} → {medidas['p50_us']:>9.1f}µs  {variacao:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 100_000, 10_000_000],
+                        help="linhas sintéticas em cada rodada (padrão: 1000 100000 10000000)")
+    parser.add_argument("--eventos", type=int, default=1000, help="eventos sintéticos (padrão: 1000)")
+    parser.add_argument("--repeticoes", type=int, default=500, help="chamadas medidas por função (padrão: 500)")
+    parser.add_argument("--saida", help="arquivo JSON (padrão: bench/resultados/micro-<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de uma rodada anterior para mostrar a variação")
+    parser.add_argument("--manter", action="store_true", help="não apaga as linhas sintéticas no fim")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    gerador = random.Random(args.semente)
+    conn = conectar_carga()
+    limpar(conn)
+
+    resultado = dict(
+        commit=commit_atual(),
+        data=datetime.datetime.now().isoformat(timespec="seconds"),
+        eventos=args.eventos,
+        repeticoes=args.repeticoes,
+        preparadas=agyte_db.MODO_PREPARADAS,
+        resultados={},
+    )
+    carregadas = 0
+    # CPFs novos ficam acima de qualquer índice sintético
+    proximo_cpf = max(args.tamanhos) * 2
+    try:
+        for tamanho in sorted(args.tamanhos):
+            inicio = time.perf_counter()
+            # As linhas já carregadas continuam; só o que falta até `tamanho` entra
+            carregar(conn, carregadas, tamanho, args.eventos)
+            carregadas = tamanho
+            print(f"{tamanho:>12,} linhas carregadas em {time.perf_counter() - inicio:.1f}s")
+
+            medidas = medir_tamanho(tamanho, args.eventos, args.repeticoes, gerador, proximo_cpf)
+            proximo_cpf += (args.repeticoes + AQUECIMENTO) * 2 + 10
+            resultado["resultados"][str(tamanho)] = medidas
+            for funcao, valores in medidas.items():
+                print(f"{'':>12} {funcao:<24} p50 {valores['p50_us']:>9.1f}µs  p95 {valores['p95_us']:>9.1f}µs  "
+                      f"p99 {valores['p99_us']:>9.1f}µs  {valores['ops_s']:>9.1f} ops/s")
+
+            # As inscrições medidas entram em eventos sintéticos; os contadores voltam ao normal
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM public.agyte_participantes WHERE nome = 'BENCH NOVO'")
+                recalcular(cur)
+    finally:
+        if not args.manter:
+            limpar(conn)
+        conn.close()
+
+    saida = args.saida or os.path.join(RAIZ, "bench", "resultados", f"micro-{resultado['commit']}.json")
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    with open(saida, "w") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nresultado gravado em {saida}")
+
+    if args.comparar:
+        comparar(resultado, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+-- CPF canônico (somente dígitos) com índice único por evento.
+--
+-- Substitui o filtro REPLACE(REPLACE(cpf, '.', ''), '-', '') = ..., que não usa
+-- índice, por uma busca em (evento, cpf_normalizado). O índice único passa a
+-- ser a fonte de verdade para CPF duplicado: o app trata a violação dele como
+-- "CPF já cadastrado".
+--
+-- Rode com psql sem --single-transaction (CREATE INDEX CONCURRENTLY não roda
+-- dentro de transação):
+--   psql "$DATABASE_URL" -f sql/001_cpf_normalizado.sql
+
+ALTER TABLE public.agyte_participantes
+    ADD COLUMN IF NOT EXISTS cpf_normalizado text;
+
+-- O banco preenche a coluna a partir de cpf em todo INSERT e UPDATE, inclusive
+-- os de instâncias antigas do app durante o deploy, que não a conhecem: um
+-- NULL escaparia do índice único. Trigger em vez de coluna GENERATED porque
+-- esta dispensa reescrever a tabela e aceita quem ainda grava a coluna.
+CREATE OR REPLACE FUNCTION public.agyte_normalizar_cpf() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.cpf_normalizado := regexp_replace(NEW.cpf, '[^0-9]', '', 'g');
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS agyte_participantes_normalizar_cpf ON public.agyte_participantes;
+CREATE TRIGGER agyte_participantes_normalizar_cpf
+    BEFORE INSERT OR UPDATE OF cpf, cpf_normalizado ON public.agyte_participantes
+    FOR EACH ROW EXECUTE FUNCTION public.agyte_normalizar_cpf();
+
+-- Backfill único das linhas que já existem (as novas já passam pelo trigger)
+UPDATE public.agyte_participantes
+SET cpf_normalizado = regexp_replace(cpf, '[^0-9]', '', 'g')
+WHERE cpf_normalizado IS NULL;
+
+-- Se o índice falhar por duplicidade, os CPFs repetidos aparecem aqui:
+--   SELECT evento, cpf_normalizado, COUNT(*)
+--   FROM public.agyte_participantes
+--   GROUP BY 1, 2 HAVING COUNT(*) > 1;
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS agyte_participantes_evento_cpf_uidx
+    ON public.agyte_participantes (evento, cpf_normalizado);
+
+-- Com o trigger e o backfill, a coluna não recebe mais NULL. O NOT NULL varre
+-- a tabela sob lock exclusivo; rode fora do horário de inscrições:
+--   ALTER TABLE public.agyte_participantes ALTER COLUMN cpf_normalizado SET NOT NULL;
@@ -0,0 +1,40 @@
+-- Contador por evento: vagas emitidas e próximo número VIP.
+--
+-- A inscrição aloca o número com um único UPDATE ... RETURNING nesta linha,
+-- cujo lock de linha serializa as inscrições do mesmo evento. Contagem de
+-- vagas e próximo número viram leituras de uma linha, em vez de COUNT(*) e
+-- MAX(numero_vip) sobre o evento inteiro.
+--
+--   psql "$DATABASE_URL" -f sql/002_evento_contadores.sql
+
+CREATE TABLE IF NOT EXISTS public.agyte_evento_contadores (
+    evento         text PRIMARY KEY,
+    emitidos       integer NOT NULL DEFAULT 0,
+    proximo_numero integer NOT NULL DEFAULT 1
+);
+
+-- Carga inicial a partir das inscrições existentes. Pode ser repetida para
+-- ressincronizar, com o app parado, se alguém mexer na tabela à mão.
+INSERT INTO public.agyte_evento_contadores (evento, emitidos, proximo_numero)
+SELECT evento, COUNT(*), COALESCE(MAX(numero_vip), 0) + 1
+FROM public.agyte_participantes
+GROUP BY evento
+ON CONFLICT (evento) DO UPDATE
+SET emitidos = EXCLUDED.emitidos,
+    proximo_numero = EXCLUDED.proximo_numero;
+
+-- Excluir uma inscrição libera a vaga. O número VIP não é reaproveitado.
+CREATE OR REPLACE FUNCTION public.agyte_liberar_vaga() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE public.agyte_evento_contadores
+    SET emitidos = emitidos - 1
+    WHERE evento = OLD.evento;
+    RETURN OLD;
+END
+$$;
+
+DROP TRIGGER IF EXISTS agyte_participantes_liberar_vaga ON public.agyte_participantes;
+CREATE TRIGGER agyte_participantes_liberar_vaga
+    AFTER DELETE ON public.agyte_participantes
+    FOR EACH ROW EXECUTE FUNCTION public.agyte_liberar_vaga();
@@ -0,0 +1,22 @@
+-- Avisa os servidores do app (LISTEN agyte_inscricoes) a cada mudança nos
+-- contadores de um evento, para que os contadores da página fiquem ao vivo
+-- sem cada visitante consultar o banco. A notificação só sai no COMMIT.
+--
+--   psql "$DATABASE_URL" -f sql/003_notificar_inscricoes.sql
+
+CREATE OR REPLACE FUNCTION public.agyte_notificar_contadores() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('agyte_inscricoes', json_build_object(
+        'evento', NEW.evento,
+        'emitidos', NEW.emitidos,
+        'proximo_numero', NEW.proximo_numero
+    )::text);
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS agyte_evento_contadores_notificar ON public.agyte_evento_contadores;
+CREATE TRIGGER agyte_evento_contadores_notificar
+    AFTER INSERT OR UPDATE ON public.agyte_evento_contadores
+    FOR EACH ROW EXECUTE FUNCTION public.agyte_notificar_contadores();
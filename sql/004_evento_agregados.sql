@@ -0,0 +1,48 @@
+-- Inscrições por (evento, setor, unidade), mantidas por trigger.
+--
+-- Perguntas como "quantos da PRODUÇÃO na DILADY" viram leitura por chave
+-- primária, em vez de GROUP BY sobre agyte_participantes.
+--
+--   psql "$DATABASE_URL" -f sql/004_evento_agregados.sql
+
+CREATE TABLE IF NOT EXISTS public.agyte_evento_agregados (
+    evento  text    NOT NULL,
+    setor   text    NOT NULL,
+    unidade text    NOT NULL,
+    total   integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (evento, setor, unidade)
+);
+
+CREATE OR REPLACE FUNCTION public.agyte_atualizar_agregados() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE public.agyte_evento_agregados
+        SET total = total - 1
+        WHERE evento = OLD.evento
+          AND setor = COALESCE(OLD.setor, '')
+          AND unidade = COALESCE(OLD.unidade, '');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.agyte_evento_agregados (evento, setor, unidade, total)
+        VALUES (NEW.evento, COALESCE(NEW.setor, ''), COALESCE(NEW.unidade, ''), 1)
+        ON CONFLICT (evento, setor, unidade) DO UPDATE
+        SET total = agyte_evento_agregados.total + 1;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS agyte_participantes_agregados ON public.agyte_participantes;
+CREATE TRIGGER agyte_participantes_agregados
+    AFTER INSERT OR DELETE OR UPDATE OF evento, setor, unidade ON public.agyte_participantes
+    FOR EACH ROW EXECUTE FUNCTION public.agyte_atualizar_agregados();
+
+-- Carga inicial a partir das inscrições existentes. Pode ser repetida para
+-- ressincronizar, com o app parado.
+INSERT INTO public.agyte_evento_agregados (evento, setor, unidade, total)
+SELECT evento, COALESCE(setor, ''), COALESCE(unidade, ''), COUNT(*)
+FROM public.agyte_participantes
+GROUP BY 1, 2, 3
+ON CONFLICT (evento, setor, unidade) DO UPDATE
+SET total = EXCLUDED.total;
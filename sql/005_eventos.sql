@@ -0,0 +1,26 @@
+-- Catálogo de eventos: um servidor do app atende todos os eventos ativos,
+-- escolhidos pela URL (?evento=CODIGO). O app carrega a tabela inteira na
+-- memória e relê a cada CATALOGO_TTL segundos.
+--
+--   psql "$DATABASE_URL" -f sql/005_eventos.sql
+
+CREATE TABLE IF NOT EXISTS public.agyte_eventos (
+    evento      text    PRIMARY KEY,  -- mesmo código gravado em agyte_participantes.evento
+    nome        text    NOT NULL,
+    capacidade  integer NOT NULL CHECK (capacidade > 0),
+    data_evento date    NOT NULL,
+    horario     time    NOT NULL,
+    endereco    text    NOT NULL,     -- uma linha do endereço por linha do texto
+    ativo       boolean NOT NULL DEFAULT true
+);
+
+INSERT INTO public.agyte_eventos (evento, nome, capacidade, data_evento, horario, endereco)
+VALUES (
+    'FUNCIONAL',
+    'TREINO FUNCIONAL PREMIUM',
+    50,
+    '2026-01-30',
+    '17:50',
+    E'Rua Conselheiro Galvão, 77\nMaraponga/Parangaba\nFortaleza - CE'
+)
+ON CONFLICT (evento) DO NOTHING;
@@ -0,0 +1,137 @@
+// ==============================
+// MÁSCARA E VALIDAÇÃO DO FORMULÁRIO NO NAVEGADOR
+// ==============================
+// Componente sem tela montado dentro do st.form: formata CPF e WhatsApp
+// enquanto a pessoa digita e barra o envio (clique ou Enter) com os campos
+// malformados, sem ir ao servidor. As regras espelham agyte_validacao.py,
+// que continua conferindo tudo do lado do servidor.
+
+export function digitos(texto) {
+    return (texto || "").replace(/\D/g, "");
+}
+
+export function mascararCpf(texto) {
+    const d = digitos(texto).slice(0, 11);
+    let saida = d.slice(0, 3);
+    if (d.length > 3) saida += "." + d.slice(3, 6);
+    if (d.length > 6) saida += "." + d.slice(6, 9);
+    if (d.length > 9) saida += "-" + d.slice(9);
+    return saida;
+}
+
+export function mascararTelefone(texto) {
+    const d = digitos(texto).slice(0, 11);
+    if (d.length <= 2) return d ? "(" + d : "";
+    const numero = d.slice(2);
+    // Celular com 9 dígitos: 99999-9999; fixo: 9999-9999
+    const corte = numero.length > 8 ? 5 : 4;
+    let saida = "(" + d.slice(0, 2) + ") " + numero.slice(0, corte);
+    if (numero.length > corte) saida += "-" + numero.slice(corte);
+    return saida;
+}
+
+export function cpfValido(cpf) {
+    if (cpf.length !== 11 || /^(\d)\1{10}$/.test(cpf)) return false;
+    for (const tamanho of [9, 10]) {
+        let soma = 0;
+        for (let i = 0; i < tamanho; i++) soma += Number(cpf[i]) * (tamanho + 1 - i);
+        if ((soma * 10) % 11 % 10 !== Number(cpf[tamanho])) return false;
+    }
+    return true;
+}
+
+export function erroCpf(texto) {
+    const cpf = digitos(texto);
+    if (cpf.length !== 11) return `CPF deve ter 11 números! Você digitou ${cpf.length}.`;
+    if (!cpfValido(cpf)) return "CPF inválido! Confira os números.";
+    return null;
+}
+
+export function erroTelefone(texto) {
+    const telefone = digitos(texto);
+    if (telefone.length < 10) return `Telefone deve ter pelo menos 10 números! Você digitou ${telefone.length}.`;
+    return null;
+}
+
+// Campos do formulário, pela chave (key=) do widget no Streamlit
+export const CAMPOS = [
+    { chave: "campo_nome", validar: (texto) => (texto.trim() ? null : "Preencha o nome!") },
+    { chave: "campo_cpf", mascarar: mascararCpf, validar: erroCpf },
+    { chave: "campo_telefone", mascarar: mascararTelefone, validar: erroTelefone },
+];
+
+// O campo é controlado pelo React: o valor novo passa pelo setter nativo e um
+// evento "input" para o Streamlit enxergar a mudança.
+const definirValor = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+
+function campoDoAlvo(alvo) {
+    for (const campo of CAMPOS) {
+        const caixa = alvo.closest && alvo.closest(`.st-key-${campo.chave}`);
+        if (caixa) return { campo, caixa };
+    }
+    return null;
+}
+
+export default function ({ parentElement }) {
+    const formulario = parentElement.closest('[data-testid="stForm"]');
+    if (!formulario) return;
+
+    const avisar = (caixa, mensagem) => {
+        if (mensagem) caixa.setAttribute("data-aviso", mensagem);
+        else caixa.removeAttribute("data-aviso");
+    };
+
+    const aoDigitar = (evento) => {
+        const encontrado = campoDoAlvo(evento.target);
+        if (!encontrado) return;
+        const { campo, caixa } = encontrado;
+        const entrada = evento.target;
+        if (campo.mascarar) {
+            const mascarado = campo.mascarar(entrada.value);
+            if (mascarado !== entrada.value) {
+                definirValor.call(entrada, mascarado);
+                entrada.dispatchEvent(new Event("input", { bubbles: true }));
+                return;
+            }
+        }
+        // O aviso some assim que o campo fica certo
+        if (caixa.hasAttribute("data-aviso")) avisar(caixa, campo.validar(entrada.value));
+    };
+
+    const conferir = () => {
+        let valido = true;
+        for (const campo of CAMPOS) {
+            const caixa = formulario.querySelector(`.st-key-${campo.chave}`);
+            const entrada = caixa && caixa.querySelector("input");
+            if (!entrada) continue;
+            const erro = campo.validar(entrada.value);
+            avisar(caixa, erro);
+            if (erro && valido) entrada.focus();
+            valido = valido && !erro;
+        }
+        return valido;
+    };
+
+    const barrar = (evento) => {
+        evento.preventDefault();
+        evento.stopPropagation();
+    };
+
+    const aoClicar = (evento) => {
+        if (evento.target.closest('[data-testid="stFormSubmitButton"]') && !conferir()) barrar(evento);
+    };
+
+    const aoTeclar = (evento) => {
+        if (evento.key === "Enter" && evento.target.tagName === "INPUT" && !conferir()) barrar(evento);
+    };
+
+    // Na captura, antes dos handlers do React lá embaixo
+    formulario.addEventListener("input", aoDigitar, true);
+    formulario.addEventListener("click", aoClicar, true);
+    formulario.addEventListener("keydown", aoTeclar, true);
+    return () => {
+        formulario.removeEventListener("input", aoDigitar, true);
+        formulario.removeEventListener("click", aoClicar, true);
+        formulario.removeEventListener("keydown", aoTeclar, true);
+    };
+}
@@ -0,0 +1,95 @@
+// ==============================
+// MODO ECONOMIA PARA CELULARES FRACOS
+// ==============================
+// Componente sem tela que liga a classe agyte-economia no <html>; em
+// agyte.css ela desliga as animações contínuas e os desfoques
+// (backdrop-filter). No modo automático liga quando o sistema pede menos
+// movimento ou quando a página, já aberta, não passa de QUADROS_MINIMOS
+// quadros por segundo; ?economia=1 / ?economia=0 na URL força.
+
+export const CLASSE = "agyte-economia";
+export const QUADROS_MINIMOS = 40;
+// A medição espera a página assentar e guarda o resultado no aparelho por
+// VALIDADE_MEDICAO (ms); depois disso, mede de novo
+const ESPERA_MEDICAO = 1000;
+const DURACAO_MEDICAO = 2000;
+export const VALIDADE_MEDICAO = 24 * 60 * 60 * 1000;
+const CHAVE_GUARDADA = "agyte-economia";
+const MOVIMENTO_REDUZIDO = "(prefers-reduced-motion: reduce)";
+
+export function economizar(quadrosPorSegundo, minimo = QUADROS_MINIMOS) {
+    return quadrosPorSegundo < minimo;
+}
+
+// Medição guardada que ainda vale: {economia, medidoEm, movimentoReduzido}.
+// Uma medição lenta feita com o sistema pedindo menos movimento (economia de
+// bateria, que também segura os quadros) não vale depois que o pedido passa.
+export function medicaoValida(guardada, agora, movimentoReduzido) {
+    if (!guardada || typeof guardada.medidoEm !== "number") return false;
+    if (agora - guardada.medidoEm > VALIDADE_MEDICAO || agora < guardada.medidoEm) return false;
+    return !(guardada.economia && guardada.movimentoReduzido && !movimentoReduzido);
+}
+
+function lerMedicao(janela) {
+    try {
+        return JSON.parse(janela.localStorage.getItem(CHAVE_GUARDADA));
+    } catch (erro) {
+        // Formato antigo ("1"/"0", sem data) ou valor estragado: mede de novo
+        return null;
+    }
+}
+
+export function medirQuadros(janela, duracao) {
+    return new Promise((resolver) => {
+        let quadros = 0;
+        let inicio = null;
+        const passo = (agora) => {
+            if (inicio === null) inicio = agora;
+            else quadros++;
+            if (agora - inicio < duracao) janela.requestAnimationFrame(passo);
+            else resolver((quadros * 1000) / (agora - inicio));
+        };
+        janela.requestAnimationFrame(passo);
+    });
+}
+
+export default function ({ data, parentElement }) {
+    const documento = parentElement.ownerDocument;
+    const janela = documento.defaultView;
+    const ligar = (sim) => documento.documentElement.classList.toggle(CLASSE, sim);
+    const modo = (data && data.modo) || "auto";
+
+    if (modo !== "auto") {
+        ligar(modo === "ligado");
+        return;
+    }
+    const movimento = janela.matchMedia(MOVIMENTO_REDUZIDO);
+    if (movimento.matches) {
+        ligar(true);
+        return;
+    }
+    const guardada = lerMedicao(janela);
+    if (medicaoValida(guardada, Date.now(), movimento.matches)) {
+        ligar(guardada.economia);
+        return;
+    }
+
+    let cancelado = false;
+    const espera = janela.setTimeout(() => {
+        medirQuadros(janela, DURACAO_MEDICAO).then((quadrosPorSegundo) => {
+            // Com a aba em segundo plano o navegador segura os quadros: não vale
+            if (cancelado || documento.visibilityState !== "visible") return;
+            const sim = economizar(quadrosPorSegundo);
+            janela.localStorage.setItem(CHAVE_GUARDADA, JSON.stringify({
+                economia: sim,
+                medidoEm: Date.now(),
+                movimentoReduzido: movimento.matches,
+            }));
+            ligar(sim);
+        });
+    }, ESPERA_MEDICAO);
+    return () => {
+        cancelado = true;
+        janela.clearTimeout(espera);
+    };
+}
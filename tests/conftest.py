@@ -0,0 +1,49 @@
+"""Configuração comum dos testes.
+
+Os testes marcados com `requer_postgres` só rodam com DB_HOST configurado,
+contra um banco de teste com as migrações de sql/ aplicadas; cada um usa um
+código de evento próprio, apagado no fim. Os demais usam os armazenamentos
+em memória e SQLite.
+"""
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sem fila local em disco nem ouvinte de notificações durante os testes
+os.environ.setdefault("FILA_LOCAL", "")
+os.environ.setdefault("CONTADORES_AO_VIVO", "0")
+
+import agyte_db  # noqa: E402
+
+requer_postgres = pytest.mark.skipif(not os.environ.get("DB_HOST"), reason="DB_HOST não configurado")
+
+
+def dados_inscricao(cpf, evento, capacidade=50, nome="PARTICIPANTE"):
+    """Dados de uma inscrição como inserir_participante monta."""
+    return dict(nome=nome, cpf=cpf, setor="TI", unidade="DILADY", telefone="85999999999",
+                evento=evento, capacidade=capacidade)
+
+
+def dessincronizar(cur, nome, caso):
+    """Deixa `nome` preparado só na conexão ("so_conexao") ou só no servidor ("so_servidor")."""
+    agyte_db._desfazer_preparadas(cur, [nome])
+    if caso == "so_conexao":
+        cur.connection.preparadas.add(nome)
+    else:
+        cur.execute(f"PREPARE {nome} AS {agyte_db._PREPARADAS[nome][0]}")
+
+
+@pytest.fixture
+def evento_pg():
+    """Código de evento exclusivo do teste no PostgreSQL."""
+    codigo = "TESTE_" + uuid.uuid4().hex[:8].upper()
+    yield codigo
+    with agyte_db.conexao() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM public.agyte_participantes WHERE evento = %s", (codigo,))
+            cur.execute("DELETE FROM public.agyte_evento_contadores WHERE evento = %s", (codigo,))
+            cur.execute("DELETE FROM public.agyte_evento_agregados WHERE evento = %s", (codigo,))
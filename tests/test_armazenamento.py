@@ -0,0 +1,99 @@
+"""Regras de inscrição nos armazenamentos sem PostgreSQL (memória e SQLite)."""
+import sqlite3
+import threading
+
+import pytest
+
+import agyte_db
+from agyte_db import Rejeicao
+from conftest import dados_inscricao
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def armazenamento(request, tmp_path):
+    if request.param == "memoria":
+        return agyte_db.ArmazenamentoMemoria()
+    return agyte_db.ArmazenamentoSQLite(str(tmp_path / "agyte.sqlite3"))
+
+
+def test_inscricao_sozinha_recebe_o_primeiro_numero(armazenamento):
+    resultado = armazenamento.inscrever(dados_inscricao("52998224725", "E1"))
+    assert resultado.confirmado and resultado.numero_vip == 1
+    assert armazenamento.estatisticas("E1") == agyte_db.EstatisticasEvento(1, 2)
+    assert armazenamento.cpf_existe("E1", "52998224725")
+
+
+def test_cpf_repetido_no_mesmo_evento(armazenamento):
+    armazenamento.inscrever(dados_inscricao("52998224725", "E1"))
+    resultado = armazenamento.inscrever(dados_inscricao("52998224725", "E1"))
+    assert resultado.rejeicao == Rejeicao.CPF_DUPLICADO
+    # Em outro evento o mesmo CPF entra
+    assert armazenamento.inscrever(dados_inscricao("52998224725", "E2")).numero_vip == 1
+    assert armazenamento.estatisticas("E1").total == 1
+
+
+def test_evento_esgotado(armazenamento):
+    for cpf in ("00000000001", "00000000002"):
+        assert armazenamento.inscrever(dados_inscricao(cpf, "E1", capacidade=2)).confirmado
+    resultado = armazenamento.inscrever(dados_inscricao("00000000003", "E1", capacidade=2))
+    assert resultado.rejeicao == Rejeicao.ESGOTADO
+    assert armazenamento.estatisticas("E1").total == 2
+
+
+def test_concorrencia_nao_passa_da_capacidade_nem_repete_numero(armazenamento):
+    resultados = []
+    trava = threading.Lock()
+
+    def inscrever(i):
+        # Metade dos CPFs repete: cada um só pode entrar uma vez
+        resultado = armazenamento.inscrever(dados_inscricao(f"{i % 30:011d}", "E1", capacidade=20))
+        with trava:
+            resultados.append(resultado)
+
+    threads = [threading.Thread(target=inscrever, args=(i,)) for i in range(60)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    numeros = sorted(r.numero_vip for r in resultados if r.confirmado)
+    assert numeros == list(range(1, 21))
+    assert {r.rejeicao for r in resultados if not r.confirmado} <= {Rejeicao.ESGOTADO, Rejeicao.CPF_DUPLICADO}
+    assert armazenamento.estatisticas("E1") == agyte_db.EstatisticasEvento(20, 21)
+
+
+def test_contagem_por_setor_e_unidade(armazenamento):
+    armazenamento.inscrever(dict(dados_inscricao("00000000001", "E1"), setor="TI", unidade="FINNA"))
+    armazenamento.inscrever(dict(dados_inscricao("00000000002", "E1"), setor="TI", unidade="LOVE"))
+    armazenamento.inscrever(dict(dados_inscricao("00000000003", "E1"), setor="RH", unidade="LOVE"))
+    assert armazenamento.por_setor_unidade("E1") == {("TI", "FINNA"): 1, ("TI", "LOVE"): 1, ("RH", "LOVE"): 1}
+    assert armazenamento.por_setor_unidade("E1", setor="TI") == {("TI", "FINNA"): 1, ("TI", "LOVE"): 1}
+    assert armazenamento.por_setor_unidade("E1", unidade="LOVE") == {("TI", "LOVE"): 1, ("RH", "LOVE"): 1}
+
+
+def test_catalogo_tem_o_evento_padrao(armazenamento):
+    assert armazenamento.eventos()[agyte_db.EVENTO_PADRAO.codigo] == agyte_db.EVENTO_PADRAO
+
+
+def test_implementacao_incompleta_nao_instancia():
+    class SoInscreve(agyte_db.Armazenamento):
+        def inscrever(self, dados):
+            return agyte_db._confirmacao(1)
+
+    with pytest.raises(TypeError):
+        SoInscreve()
+
+
+def test_sqlite_so_trata_o_cpf_repetido_como_recusa(tmp_path):
+    armazenamento = agyte_db.ArmazenamentoSQLite(str(tmp_path / "agyte.sqlite3"))
+    with pytest.raises(sqlite3.IntegrityError):
+        armazenamento.inscrever(dict(dados_inscricao("00000000001", "E1"), nome=None))
+
+    # Número VIP já usado (contador fora de sincronia com a tabela)
+    armazenamento._conn.execute("""
+        INSERT INTO agyte_participantes (nome, cpf_normalizado, numero_vip, evento, data_inscricao)
+        VALUES ('OUTRO', '00000000009', 1, 'E1', 0)
+    """)
+    with pytest.raises(sqlite3.IntegrityError):
+        armazenamento.inscrever(dados_inscricao("00000000002", "E1"))
+    assert armazenamento.estatisticas("E1") == agyte_db.EstatisticasEvento(0, 1)
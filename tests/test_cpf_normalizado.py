@@ -0,0 +1,20 @@
+"""cpf_normalizado preenchido pelo banco (sql/001_cpf_normalizado.sql)."""
+import agyte_db
+from agyte_db import Rejeicao
+from conftest import requer_postgres, dados_inscricao
+
+pytestmark = requer_postgres
+
+
+def test_insert_sem_a_coluna_ainda_barra_o_cpf_repetido(evento_pg):
+    # Como uma instância antiga do app, que grava só o CPF formatado
+    with agyte_db.conexao() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO public.agyte_participantes (nome, cpf, setor, unidade, telefone, numero_vip, evento)
+                VALUES ('ANTIGA', '529.982.247-25', 'TI', 'DILADY', '85999999999', 1, %s)
+                RETURNING cpf_normalizado
+            """, (evento_pg,))
+            assert cur.fetchone()[0] == "52998224725"
+        resultado = agyte_db._registrar(conn, dados_inscricao("52998224725", evento_pg))
+    assert resultado.rejeicao == Rejeicao.CPF_DUPLICADO
@@ -0,0 +1,50 @@
+"""Regras da API JSON do formulário leve (agyte_http)."""
+import http.client
+import json
+import threading
+
+import pytest
+
+import agyte_http
+from conftest import dados_inscricao
+
+
+def _pedido(**campos):
+    pedido = dict(dados_inscricao("52998224725", ""), cpf="529.982.247-25", telefone="(85) 99999-9999")
+    del pedido["capacidade"]
+    pedido.update(campos)
+    return pedido
+
+
+@pytest.mark.parametrize("campo, valor", [("cpf", 52998224725), ("nome", ["A"]), ("setor", None)])
+def test_campo_que_nao_e_texto_e_recusado(campo, valor):
+    status, corpo = agyte_http.inscrever(_pedido(**{campo: valor}))
+    assert status == 400 and corpo["status"] == "invalida"
+
+
+def test_evento_desconhecido_nao_cai_no_evento_padrao():
+    status, corpo = agyte_http.inscrever(_pedido(evento="NAO_EXISTE"))
+    assert status == 422 and corpo["status"] == "evento_desconhecido"
+    assert agyte_http._evento("NAO_EXISTE") is None
+    assert agyte_http._evento("") is not None
+
+
+def test_conexao_alem_do_limite_recebe_503():
+    servidor = agyte_http.ServidorHttp(("127.0.0.1", 0), agyte_http._Api, conexoes_max=1)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    porta = servidor.server_address[1]
+    primeira = http.client.HTTPConnection("127.0.0.1", porta, timeout=5)
+    segunda = http.client.HTTPConnection("127.0.0.1", porta, timeout=5)
+    try:
+        # Conexão persistente: continua ocupando a única vaga depois da resposta
+        primeira.request("GET", "/metrics")
+        assert primeira.getresponse().status == 200
+        segunda.request("GET", "/metrics")
+        resposta = segunda.getresponse()
+        assert resposta.status == 503 and resposta.getheader("Retry-After") == "1"
+        assert json.loads(resposta.read())["status"] == "erro"
+    finally:
+        primeira.close()
+        segunda.close()
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,112 @@
+"""Escrita em lote (_registrar_lote): uma transação para várias inscrições."""
+import threading
+
+import pytest
+
+import agyte_db
+from agyte_db import Rejeicao
+from conftest import requer_postgres, dados_inscricao, dessincronizar
+
+pytestmark = requer_postgres
+
+
+@pytest.mark.skipif(agyte_db.MODO_PREPARADAS == "desligado", reason="DB_PREPARADAS=desligado")
+@pytest.mark.parametrize("caso", ["so_conexao", "so_servidor"])
+def test_lote_com_preparada_dessincronizada(evento_pg, caso):
+    pedidos = [dados_inscricao("52998224725", evento_pg), dados_inscricao("39053344705", evento_pg)]
+    with agyte_db.conexao() as conn:
+        with conn.cursor() as cur:
+            dessincronizar(cur, "agyte_garantir_contador", caso)
+        resultados = agyte_db._registrar_lote(conn, pedidos)
+    assert [r.numero_vip for r in resultados] == [1, 2]
+
+
+def test_lote_resolve_cpf_repetido_e_capacidade_na_ordem_de_chegada(evento_pg):
+    pedidos = [
+        dados_inscricao("00000000001", evento_pg, capacidade=3),
+        dados_inscricao("00000000001", evento_pg, capacidade=3),  # repetido dentro do lote
+        dados_inscricao("00000000002", evento_pg, capacidade=3),
+        dados_inscricao("00000000009", evento_pg, capacidade=3),  # já inscrito antes do lote
+        dados_inscricao("00000000003", evento_pg, capacidade=3),
+        dados_inscricao("00000000004", evento_pg, capacidade=3),  # passou da capacidade
+    ]
+    with agyte_db.conexao() as conn:
+        assert agyte_db._registrar(conn, dados_inscricao("00000000009", evento_pg, capacidade=3)).numero_vip == 1
+        resultados = agyte_db._registrar_lote(conn, pedidos)
+
+    assert [r.numero_vip for r in resultados] == [2, None, 3, None, None, None]
+    assert [r.rejeicao for r in resultados] == [
+        None, Rejeicao.CPF_DUPLICADO, None, Rejeicao.CPF_DUPLICADO, Rejeicao.ESGOTADO, Rejeicao.ESGOTADO
+    ]
+    assert agyte_db._consultar_estatisticas.__wrapped__(evento_pg) == agyte_db.EstatisticasEvento(3, 4)
+
+
+def test_lote_de_uma_inscricao_usa_o_caminho_simples(evento_pg):
+    def sozinha(cpf):
+        resultado, = agyte_db._registrar_lote(conn, [dados_inscricao(cpf, evento_pg, capacidade=2)])
+        return resultado
+
+    with agyte_db.conexao() as conn:
+        assert sozinha("00000000001").numero_vip == 1
+        assert sozinha("00000000001").rejeicao == Rejeicao.CPF_DUPLICADO
+        assert sozinha("00000000002").numero_vip == 2
+        assert sozinha("00000000003").rejeicao == Rejeicao.ESGOTADO
+
+
+def test_escritor_em_grupo_com_sessoes_simultaneas(evento_pg):
+    escritor = agyte_db.EscritorEmGrupo(janela=0.02, lote=8).iniciar()
+    resultados = [None] * 40
+
+    def enviar(i):
+        resultados[i] = escritor.enviar(dados_inscricao(f"{i % 25:011d}", evento_pg, capacidade=15))
+
+    threads = [threading.Thread(target=enviar, args=(i,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(r.numero_vip for r in resultados if r.confirmado) == list(range(1, 16))
+    assert {r.rejeicao for r in resultados if not r.confirmado} == {Rejeicao.ESGOTADO, Rejeicao.CPF_DUPLICADO}
+    # Inscrição sozinha, fora de pico
+    assert escritor.enviar(dados_inscricao("00000000099", evento_pg, capacidade=15)).rejeicao == Rejeicao.ESGOTADO
+
+
+def test_fila_local_reenvia_e_resolve_cada_protocolo(evento_pg, tmp_path):
+    fila = agyte_db.FilaLocal(str(tmp_path / "fila.sqlite3"))
+    with agyte_db.conexao() as conn:
+        # Já gravada no banco antes de a conexão cair: volta como confirmada
+        agyte_db._registrar(conn, dados_inscricao("00000000001", evento_pg, capacidade=3))
+
+    protocolos = [
+        fila.enfileirar(dados_inscricao(cpf, evento_pg, capacidade=3)).protocolo
+        for cpf in ("00000000001", "00000000002", "00000000003")
+    ]
+    assert all(protocolos)
+    # O mesmo CPF não entra duas vezes na fila
+    assert fila.enfileirar(dados_inscricao("00000000002", evento_pg, capacidade=3)).rejeicao == Rejeicao.CPF_DUPLICADO
+    # Vagas ocupadas no banco mais as pendentes na fila: não cabe mais ninguém
+    recusada = fila.enfileirar(dados_inscricao("00000000005", evento_pg, capacidade=3), ocupadas=1)
+    assert recusada.rejeicao == Rejeicao.ESGOTADO and recusada.protocolo is None
+
+    with agyte_db.conexao() as conn:
+        # Alguém entrou enquanto a fila esperava
+        agyte_db._registrar(conn, dados_inscricao("00000000004", evento_pg, capacidade=3))
+    assert fila.consultar(protocolos[0]).pendente
+
+    fila.reenviar()
+    resultados = [fila.consultar(protocolo) for protocolo in protocolos]
+    assert [(r.numero_vip, r.rejeicao) for r in resultados] == [(1, None), (3, None), (None, Rejeicao.ESGOTADO)]
+    assert resultados[0].confirmado and resultados[0].protocolo == protocolos[0]
+    assert fila.consultar("P-NAOEXISTE") is None
+
+
+def test_fila_local_nao_confirma_outra_pessoa_com_o_mesmo_cpf(evento_pg, tmp_path):
+    fila = agyte_db.FilaLocal(str(tmp_path / "fila.sqlite3"))
+    with agyte_db.conexao() as conn:
+        agyte_db._registrar(conn, dados_inscricao("00000000001", evento_pg, nome="TITULAR"))
+
+    protocolo = fila.enfileirar(dados_inscricao("00000000001", evento_pg, nome="OUTRA PESSOA")).protocolo
+    fila.reenviar()
+    resultado = fila.consultar(protocolo)
+    assert resultado.rejeicao == Rejeicao.CPF_DUPLICADO and resultado.numero_vip is None
@@ -0,0 +1,44 @@
+"""Consultas preparadas por conexão: conexão e servidor fora de sincronia."""
+import psycopg2.extensions
+import pytest
+
+import agyte_db
+from conftest import requer_postgres, dessincronizar
+
+pytestmark = [
+    requer_postgres,
+    pytest.mark.skipif(agyte_db.MODO_PREPARADAS == "desligado", reason="DB_PREPARADAS=desligado"),
+]
+
+
+def _no_servidor(cur):
+    cur.execute("SELECT name FROM pg_prepared_statements")
+    return {linha[0] for linha in cur.fetchall()}
+
+
+@pytest.mark.parametrize("caso", ["so_conexao", "so_servidor"])
+def test_reprepara_em_autocommit(evento_pg, caso):
+    with agyte_db.conexao() as conn, conn.cursor() as cur:
+        dessincronizar(cur, "agyte_estatisticas", caso)
+        agyte_db.executar(cur, ("agyte_estatisticas",), dict(evento=evento_pg))
+        assert cur.fetchone() is None
+        assert "agyte_estatisticas" in conn.preparadas
+        assert "agyte_estatisticas" in _no_servidor(cur)
+
+
+@pytest.mark.parametrize("caso", ["so_conexao", "so_servidor"])
+def test_reprepara_dentro_de_transacao_sem_aborta_la(evento_pg, caso):
+    with agyte_db.conexao() as conn, conn.cursor() as cur:
+        # Outra consulta preparada na conexão não pode ser perdida no caminho
+        agyte_db.executar(cur, ("agyte_cpf_existe",), dict(evento=evento_pg, cpf="0"))
+        dessincronizar(cur, "agyte_estatisticas", caso)
+
+        cur.execute("BEGIN")
+        cur.execute("SELECT 1")
+        agyte_db.executar(cur, ("agyte_estatisticas",), dict(evento=evento_pg))
+        assert cur.fetchone() is None
+        assert conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        cur.execute("ROLLBACK")
+
+        assert {"agyte_estatisticas", "agyte_cpf_existe"} <= conn.preparadas
+        assert {"agyte_estatisticas", "agyte_cpf_existe"} <= _no_servidor(cur)
@@ -0,0 +1,32 @@
+"""Rastreio das instruções SQL (agyte_sql_*)."""
+import psycopg2
+import pytest
+
+import agyte_db
+import agyte_metricas as metricas
+from conftest import requer_postgres
+
+pytestmark = [
+    requer_postgres,
+    pytest.mark.skipif(not agyte_db.RASTREIO_SQL, reason="SQL_RASTREIO desligado"),
+]
+
+CONSULTA = "teste_divisao_por_zero"
+
+
+def _medidas():
+    """Instruções CONSULTA medidas até agora, de qualquer função."""
+    return sum(serie[-1] for chave, serie in metricas.SQL_DURACAO._series.items() if chave[0] == CONSULTA)
+
+
+def test_instrucao_que_falha_tambem_e_medida():
+    erros_antes = metricas.SQL_ERROS._valores.get((CONSULTA, "DivisionByZero"), 0)
+    medidas_antes = _medidas()
+
+    with agyte_db.conexao() as conn, conn.cursor() as cur:
+        with pytest.raises(psycopg2.errors.DivisionByZero):
+            cur.consulta = CONSULTA
+            cur.execute("SELECT 1 / 0")
+
+    assert metricas.SQL_ERROS._valores.get((CONSULTA, "DivisionByZero"), 0) == erros_antes + 1
+    assert _medidas() == medidas_antes + 1
@@ -0,0 +1,16 @@
+"""Roteamento das leituras de exibição entre réplica e primário."""
+import agyte_db
+
+
+def test_releitura_logo_apos_inscricao_vai_ao_primario(monkeypatch):
+    monkeypatch.setattr(agyte_db, "_escritas", {})
+    assert agyte_db._ler_da_replica("E1")
+
+    agyte_db._apos_inscricao("E1")
+    assert not agyte_db._ler_da_replica("E1")
+    # Os outros eventos continuam na réplica
+    assert agyte_db._ler_da_replica("E2")
+
+    # Passado o atraso tolerado, a réplica já tem a inscrição
+    agyte_db._escritas["E1"] -= agyte_db.ATRASO_MAXIMO_REPLICA + 1
+    assert agyte_db._ler_da_replica("E1")
@@ -0,0 +1,32 @@
+"""Situação de um ResultadoInscricao e o rótulo contado nas métricas."""
+import agyte_db
+import agyte_metricas as metricas
+from agyte_db import Rejeicao, ResultadoInscricao
+
+
+def test_confirmado_pendente_e_recusado_se_excluem():
+    confirmado = agyte_db._confirmacao(7)
+    pendente = agyte_db._pendente("P-1")
+    recusado = agyte_db._recusa_esgotado(10)
+    assert confirmado.confirmado and not confirmado.pendente
+    assert pendente.pendente and not pendente.confirmado
+    assert not recusado.confirmado and not recusado.pendente
+
+
+def _contagens():
+    return {chave[0]: valor for chave, valor in metricas.INSCRICOES._valores.items()}
+
+
+def test_resultado_da_fila_local_conta_como_pendente(monkeypatch):
+    class FilaLocalSempre:
+        def inscrever(self, dados):
+            return ResultadoInscricao(protocolo="P-1", mensagem="Inscrição recebida!")
+
+    monkeypatch.setattr(agyte_db, "obter_armazenamento", lambda: FilaLocalSempre())
+    antes = _contagens()
+    resultado = agyte_db.inserir_participante("Nome", "52998224725", "TI", "DILADY", "85999999999", evento="E1")
+    depois = _contagens()
+
+    assert resultado.pendente and resultado.rejeicao != Rejeicao.ERRO
+    assert depois.get("pendente", 0) == antes.get("pendente", 0) + 1
+    assert depois.get("confirmada", 0) == antes.get("confirmada", 0)